@@ -12,8 +12,10 @@ public partial class Assembler
 {
     public partial class Encoder
     {
-        private const string EncodingSchemaPath = "Raze.Src.Assembly.Assembler.Resources.EncodingSchema.json";
+        private const string EncodingSchemaPath = "Raze.Src.Assembly.Assembler.Resources.EncodingSchema.bin";
         Dictionary<string, List<Encoding>> instructionEncodings;
+        // Per mnemonic, the operand signatures mapped to the encodings they match (see EncodingIndex.cs)
+        Dictionary<string, Dictionary<uint, byte[]>> encodingIndex;
 
         internal Encoder() 
         {
@@ -26,21 +28,31 @@ public partial class Assembler
                 "Could not locate Encoding Schema file"
             );
 
-            instructionEncodings = JsonSerializer.Deserialize<Dictionary<string, List<Encoding>>>(stream);
+            (instructionEncodings, encodingIndex) = ReadEncodingSchema(stream);
         }
 
         internal Encoding GetEncoding(AssemblyExpr.OperandInstruction instruction, Assembler assembler, out bool refResolve)
         {
             Operand[] operands = instruction.Operands.Select(x => x.ToAssemblerOperand()).ToArray();
+            string mnemonic = instruction.instruction.ToString();
             
-            if (instructionEncodings.TryGetValue(instruction.instruction.ToString(), out var encodings))
+            if (instructionEncodings.TryGetValue(mnemonic, out var encodings))
             {
                 if (EncodingUtils.IsReferenceLiteralOperand(ref operands[^1], instruction, assembler, out var labelLiteral, out refResolve))
                 {
                     (Operand.OperandSize absoluteJump, Operand.OperandSize relativeJump) =
                         EncodingUtils.HandleUnresolvedRef(instruction, labelLiteral, assembler);
 
-                    foreach (Encoding encoding in encodings)
+                    operands[^1].size = relativeJump;
+                    bool indexed = TryGetCandidates(mnemonic, operands, out var relativeCandidates);
+                    operands[^1].size = absoluteJump;
+                    indexed &= TryGetCandidates(mnemonic, operands, out var absoluteCandidates);
+
+                    IEnumerable<Encoding> candidates = indexed ?
+                        MergeCandidates(relativeCandidates, absoluteCandidates).Select(x => encodings[x]) :
+                        encodings;
+
+                    foreach (Encoding encoding in candidates)
                     {
                         operands[^1].size = encoding.encodingType.HasFlag(Encoding.EncodingTypes.RelativeJump) ? relativeJump : absoluteJump;
 
@@ -50,6 +62,16 @@ public partial class Assembler
                         }
                     }
                 }
+                else if (TryGetCandidates(mnemonic, operands, out var candidates))
+                {
+                    foreach (byte candidate in candidates)
+                    {
+                        if (encodings[candidate].SpecialMatch(instruction, operands))
+                        {
+                            return encodings[candidate];
+                        }
+                    }
+                }
                 else
                 {
                     foreach (Encoding encoding in encodings)
@@ -67,9 +89,12 @@ public partial class Assembler
         {
             if (instructionEncodings.TryGetValue(zero.instruction.ToString(), out var encodings))
             {
-                if (encodings.Count != 0)
+                foreach (Encoding encoding in encodings)
                 {
-                    return encodings[0];
+                    if (!EncodingUtils.HasRepeatPrefix(encoding.encodingType))
+                    {
+                        return encoding;
+                    }
                 }
             }
             throw Diagnostics.Panic(new Diagnostic.ImpossibleDiagnostic("Invalid/Unsupported Instruction"));
@@ -12,6 +12,24 @@ public partial class Assembler
     {
         internal partial class Encoding
         {
+            public Encoding()
+            {
+            }
+
+            internal Encoding(Operand[] operands, EncodingTypes encodingType, byte[] opCode, byte opCodeExtension)
+            {
+                this.operands = operands;
+                this.encodingType = encodingType;
+                this.opCode = opCode;
+                OpCodeExtension = opCodeExtension;
+            }
+
+            internal Encoding(Operand[] operands, EncodingTypes encodingType, byte[] opCode, byte opCodeExtension, VexFields? vex, string[] features) : this(operands, encodingType, opCode, opCodeExtension)
+            {
+                Vex = vex;
+                Features = features;
+            }
+
             public string Instruction
             {
                 set => operands = GetOperandsFromInstruction(value);
@@ -37,6 +55,12 @@ public partial class Assembler
             }
             internal byte[] opCode;
 
+            // Set for VEX-encoded (AVX/AVX2/FMA) encodings
+            public VexFields? Vex { get; set; }
+
+            // CPUID features the encoding requires (e.g. POPCNT, SSE4_1). Alternatives are joined by '|' (e.g. AVX512F|AVX10.1)
+            public string[] Features { get; set; } = [];
+
             public bool Matches(params Operand[] operands)
             {
                 if (this.operands.Length != operands.Length)
@@ -55,6 +79,16 @@ public partial class Assembler
 
             public bool SpecialMatch(AssemblyExpr.OperandInstruction assemblyExpr, params Operand[] operands)
             {
+                if (EncodingUtils.HasRepeatPrefix(encodingType))
+                {
+                    return false;
+                }
+                // The assembler does not emit VEX prefixes yet, so VEX encodings are in the schema but never selected
+                if (Vex != null)
+                {
+                    return false;
+                }
+
                 foreach (var (operand, idx) in assemblyExpr.Operands
                     .Select((op, idx) => (op, idx))
                     .Where(x => Operand.OperandType.IMM.HasFlag(operands[x.idx].type)))
@@ -0,0 +1,99 @@
+﻿using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace Raze;
+
+public partial class Assembler
+{
+    public partial class Encoder
+    {
+        // Kinds of the operands encodings are looked up with, numbered by their position. Must match signature_operand_types of the instruction generator
+        private static readonly Operand.OperandType[] SignatureOperandTypes =
+        [
+            Operand.OperandType.A,
+            Operand.OperandType.C,
+            Operand.OperandType.R,
+            Operand.OperandType.XMM,
+            Operand.OperandType.M,
+            Operand.OperandType.MOFFS,
+            Operand.OperandType.IMM,
+            Operand.OperandType.One
+        ];
+        private const int MaxSignatureOperands = sizeof(uint);
+        // An operand's size takes the low 5 bits of its byte. Operands of larger sizes (e.g. 32-byte memory) are not indexed
+        private const int SignatureOperandSizeLimit = 1 << 5;
+
+        // A byte per operand (its kind's index in SignatureOperandTypes, and its size), most significant byte first.
+        // Every operand byte is non-zero, so signatures of different operand counts never collide
+        internal static uint ToSignature(ReadOnlySpan<byte> signature)
+        {
+            uint result = 0;
+            foreach (byte operand in signature)
+            {
+                result = result << 8 | operand;
+            }
+            return result;
+        }
+
+        private static bool TryGetSignature(Operand[] operands, out uint signature)
+        {
+            signature = 0;
+            if (operands.Length > MaxSignatureOperands)
+            {
+                return false;
+            }
+
+            foreach (Operand operand in operands)
+            {
+                int kind = Array.IndexOf(SignatureOperandTypes, operand.type);
+                if (kind == -1 || (int)operand.size >= SignatureOperandSizeLimit)
+                {
+                    return false;
+                }
+                signature = signature << 8 | (uint)(kind << 5 | (int)operand.size);
+            }
+            return true;
+        }
+
+        // Returns the indices of the mnemonic's encodings the operands match (Encoding.Matches), in priority order.
+        // Returns false when the operands cannot be looked up, in which case the encodings must be scanned instead
+        private bool TryGetCandidates(string mnemonic, Operand[] operands, out byte[] candidates)
+        {
+            if (!TryGetSignature(operands, out uint signature))
+            {
+                candidates = [];
+                return false;
+            }
+            if (!encodingIndex[mnemonic].TryGetValue(signature, out candidates!))
+            {
+                candidates = [];
+            }
+            return true;
+        }
+
+        // Merges the candidates of the relative and absolute reference sizes back into priority order
+        private static IEnumerable<byte> MergeCandidates(byte[] first, byte[] second)
+        {
+            int i = 0, j = 0;
+            while (i < first.Length || j < second.Length)
+            {
+                if (j == second.Length || (i < first.Length && first[i] < second[j]))
+                {
+                    yield return first[i++];
+                }
+                else if (i == first.Length || second[j] < first[i])
+                {
+                    yield return second[j++];
+                }
+                else
+                {
+                    yield return first[i++];
+                    j++;
+                }
+            }
+        }
+    }
+}
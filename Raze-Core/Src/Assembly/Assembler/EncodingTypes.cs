@@ -24,7 +24,9 @@ public partial class Assembler
                 ZeroExtends = 32,
                 AddRegisterToOpCode = 64,
                 RelativeJump = 128,
-                NoUpper8BitEncoding = 256
+                NoUpper8BitEncoding = 256,
+                RepPrefix = 512,
+                RepnePrefix = 1024
             }
         }
     }
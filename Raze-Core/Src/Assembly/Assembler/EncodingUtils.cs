@@ -41,6 +41,9 @@ public partial class Assembler
 
             internal static bool SetSizePrefix(Encoding.EncodingTypes encodingType) => encodingType.HasFlag(Encoding.EncodingTypes.SizePrefix);
 
+            // AssemblyExpr instructions carry no REP/REPE/REPNE prefix, so they are never assembled with a repeat-prefixed encoding
+            internal static bool HasRepeatPrefix(Encoding.EncodingTypes encodingType) => (encodingType & (Encoding.EncodingTypes.RepPrefix | Encoding.EncodingTypes.RepnePrefix)) != 0;
+
             internal static bool BaseAddressingModeMustHaveDisplacement(AssemblyExpr.Register register) =>
                 register.name == AssemblyExpr.Register.RegisterName.RBP ||
                 register.name == AssemblyExpr.Register.RegisterName.R13;
@@ -64,6 +64,9 @@ public partial class Assembler
                         "XMM" => new Operand(Operand.OperandType.XMM, ConstantSize(operandsStrings[i], subStrIdx, Operand.OperandSize._128Bits)),
                         "XMMRM" => new Operand(Operand.OperandType.XMM | Operand.OperandType.M, ToSize(operandsStrings[i], subStrIdx)),
 
+                        "YMM" => new Operand(Operand.OperandType.YMM, ConstantSize(operandsStrings[i], subStrIdx, Operand.OperandSize._256Bits)),
+                        "YMMRM" => new Operand(Operand.OperandType.YMM | Operand.OperandType.M, ToSize(operandsStrings[i], subStrIdx)),
+
                         "MMX" => new Operand(Operand.OperandType.MMX, ConstantSize(operandsStrings[i], subStrIdx, Operand.OperandSize._128Bits)),
                         "MMXRM" => new Operand(Operand.OperandType.MMX | Operand.OperandType.M, ToSize(operandsStrings[i], subStrIdx)),
 
@@ -94,6 +97,7 @@ public partial class Assembler
                 {
                     return sizeStr[start..] switch
                     {
+                        "256" => Operand.OperandSize._256Bits,
                         "128" => Operand.OperandSize._128Bits,
                         "64" => Operand.OperandSize._64Bits,
                         "32" => Operand.OperandSize._32Bits,
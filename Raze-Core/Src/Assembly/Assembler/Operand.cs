@@ -28,7 +28,8 @@ public partial class Assembler
             internal static readonly Dictionary<OperandType, OperandSize> constantSizeOperandTypeRM = new()
             {
                 { OperandType.XMM, OperandSize._128Bits },
-                { OperandType.MMX, OperandSize._64Bits }
+                { OperandType.MMX, OperandSize._64Bits },
+                { OperandType.YMM, OperandSize._256Bits }
             };
 
             internal bool Matches(Operand operand)
@@ -64,9 +65,11 @@ public partial class Assembler
                 CS = 16384,                 // Code Segment Register
                 FS = 32768,                 // FS Segment Register
                 GS = 65536,                 // GS Segment Register
+                YMM = 131072,               // AVX Register
             }
             internal enum OperandSize
             {
+                _256Bits = 32,
                 _128Bits = 16,
                 _64Bits = 8,
                 _32Bits = 4,
@@ -0,0 +1,91 @@
+﻿using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace Raze;
+
+public partial class Assembler
+{
+    public partial class Encoder
+    {
+        // Layout is defined by the instruction generator (Tools/x86_64_Linux_Generators/GenerateInstructionsForRaze/GenerateRazeInstructions/write_binary_schema.py)
+        private static ReadOnlySpan<byte> EncodingSchemaMagic => "RZES"u8;
+        private const ushort EncodingSchemaVersion = 4;
+
+        private static (Dictionary<string, List<Encoding>>, Dictionary<string, Dictionary<uint, byte[]>>) ReadEncodingSchema(Stream stream)
+        {
+            using var reader = new BinaryReader(stream);
+
+            Diagnostics.Assert(
+                reader.ReadBytes(EncodingSchemaMagic.Length).AsSpan().SequenceEqual(EncodingSchemaMagic),
+                "Invalid Encoding Schema file"
+            );
+            ushort version = reader.ReadUInt16();
+            Diagnostics.Assert(
+                version == EncodingSchemaVersion,
+                $"Unsupported Encoding Schema version {version}, expected {EncodingSchemaVersion}"
+            );
+
+            int mnemonicCount = reader.ReadUInt16();
+
+            var features = new string[reader.ReadByte()];
+            for (int i = 0; i < features.Length; i++)
+            {
+                features[i] = System.Text.Encoding.ASCII.GetString(reader.ReadBytes(reader.ReadByte()));
+            }
+
+            var instructionEncodings = new Dictionary<string, List<Encoding>>(mnemonicCount);
+            var encodingIndex = new Dictionary<string, Dictionary<uint, byte[]>>(mnemonicCount);
+
+            for (int i = 0; i < mnemonicCount; i++)
+            {
+                string mnemonic = System.Text.Encoding.ASCII.GetString(reader.ReadBytes(reader.ReadByte()));
+                int encodingCount = reader.ReadUInt16();
+                var encodings = new List<Encoding>(encodingCount);
+
+                for (int j = 0; j < encodingCount; j++)
+                {
+                    var encodingType = (Encoding.EncodingTypes)reader.ReadUInt16();
+                    byte opCodeExtension = reader.ReadByte();
+                    int opCodeLength = reader.ReadByte();
+                    int operandCount = reader.ReadByte();
+                    byte[] opCode = reader.ReadBytes(opCodeLength);
+
+                    var operands = new Operand[operandCount];
+                    for (int k = 0; k < operandCount; k++)
+                    {
+                        operands[k] = new Operand((Operand.OperandType)reader.ReadUInt32(), reader.ReadByte());
+                    }
+
+                    Encoding.VexFields? vex = null;
+                    if (reader.ReadBoolean())
+                    {
+                        vex = new Encoding.VexFields(reader.ReadByte(), reader.ReadByte(), reader.ReadByte(), reader.ReadByte(), reader.ReadSByte());
+                    }
+
+                    var requiredFeatures = new string[reader.ReadByte()];
+                    for (int k = 0; k < requiredFeatures.Length; k++)
+                    {
+                        requiredFeatures[k] = features[reader.ReadByte()];
+                    }
+
+                    encodings.Add(new Encoding(operands, encodingType, opCode, opCodeExtension, vex, requiredFeatures));
+                }
+                instructionEncodings[mnemonic] = encodings;
+
+                int indexEntryCount = reader.ReadUInt16();
+                var index = new Dictionary<uint, byte[]>(indexEntryCount);
+
+                for (int j = 0; j < indexEntryCount; j++)
+                {
+                    uint signature = ToSignature(reader.ReadBytes(reader.ReadByte()));
+                    index[signature] = reader.ReadBytes(reader.ReadByte());
+                }
+                encodingIndex[mnemonic] = index;
+            }
+            return (instructionEncodings, encodingIndex);
+        }
+    }
+}
@@ -0,0 +1,44 @@
+﻿using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Threading.Tasks;
+
+namespace Raze;
+
+public partial class Assembler
+{
+    public partial class Encoder
+    {
+        internal partial class Encoding
+        {
+            // Fields of the VEX prefix (Intel SDM Vol. 2, 2.3). The mandatory prefix and the 0F/0F38/0F3A escape bytes are folded into pp and mmmmm,
+            // so they are not part of the encoding's opcode
+            public class VexFields
+            {
+                public VexFields()
+                {
+                }
+
+                internal VexFields(byte l, byte pp, byte mmmmm, byte w, sbyte vvvv)
+                {
+                    L = l;
+                    this.pp = pp;
+                    this.mmmmm = mmmmm;
+                    W = w;
+                    this.vvvv = vvvv;
+                }
+
+                // Vector length: 0 = 128-bit, 1 = 256-bit
+                public byte L { get; set; }
+                // Implied mandatory prefix: 0 = none, 1 = 66, 2 = F3, 3 = F2
+                public byte pp { get; set; }
+                // Implied opcode map: 1 = 0F, 2 = 0F 38, 3 = 0F 3A
+                public byte mmmmm { get; set; }
+                public byte W { get; set; }
+                // Index of the operand encoded in VEX.vvvv, or -1 if it is unused
+                public sbyte vvvv { get; set; } = -1;
+            }
+        }
+    }
+}
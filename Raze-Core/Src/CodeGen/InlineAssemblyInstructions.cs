@@ -14,7 +14,7 @@ public abstract partial class CodeGen
     {
         public static readonly Dictionary<AssemblyExpr.Instruction, (int, Action<CodeGen, Expr.InlineAssembly.BinaryInstruction>)> supportedInstructionsBinary = new()
         {
-            { MOV, (1, Binary.DefaultInstruction) },
+            { MOV, (1, Binary.MOV) },
             { ADD, (1, Binary.DefaultInstruction) },
             { SUB, (1, Binary.DefaultInstruction) },
             { AND, (1, Binary.DefaultInstruction) },
@@ -68,6 +68,7 @@ public abstract partial class CodeGen
             { SETL, (1, Unary.DefaultInstruction) },
             { SETLE, (1, Unary.DefaultInstruction) },
             { DEC, (1, Unary.DefaultInstruction) },
+            { CALL, (0, Unary.CALL) },
         };
 
         public static readonly Dictionary<AssemblyExpr.Instruction, Action<CodeGen, Expr.InlineAssembly.NullaryInstruction>> supportedInstructionsNullary = new()
@@ -23,6 +23,22 @@ public abstract partial class CodeGen
                 DeallocVariables(codeGen, (binary.operand1, op1), (binary.operand2, op2));
             }
             
+            public static void MOV(CodeGen codeGen, Expr.InlineAssembly.BinaryInstruction binary)
+            {
+                AssemblyExpr.IValue op1 = binary.operand1.ToOperand(codeGen, AssemblyExpr.Register.RegisterSize._32Bits).NonLiteral(codeGen, binary.operand1.Type());
+                var op2 = ValidateOperand2(codeGen, binary.operand1, ref op1, binary.operand2, binary.operand2.ToOperand(codeGen, op1.Size));
+
+                if (binary.binding)
+                {
+                    codeGen.alloc.BindRegister(op1, op2);
+                }
+
+                codeGen.Emit(new AssemblyExpr.Binary(binary.instruction, op1, op2));
+
+                ReturnOperand(codeGen, binary, binary.operand1, op1);
+                DeallocVariables(codeGen, (binary.operand1, op1), (binary.operand2, op2));
+            }
+
             public static void DefaultFloatingInstruction(CodeGen codeGen, Expr.InlineAssembly.BinaryInstruction binary)
             {
                 AssemblyExpr.IValue op1 = binary.operand1.ToOperand(codeGen, AssemblyExpr.Register.RegisterSize._32Bits).NonPointerNonLiteral(codeGen, binary.operand1.Type());
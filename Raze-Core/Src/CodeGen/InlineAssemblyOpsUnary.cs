@@ -21,6 +21,19 @@ public abstract partial class CodeGen
                 ReturnOperand(codeGen, unary, unary.operand, op);
                 DeallocVariables(codeGen, (unary.operand, op));
             }
+
+            // Calls an address (e.g. a symbol of the vDSO) with the RazeCall convention. The registers the block allocated (its arguments and return register) 
+            // are left to it, while the other live values are kept in non-volatile registers across the call
+            public static void CALL(CodeGen codeGen, Expr.InlineAssembly.UnaryInstruction unary)
+            {
+                var op = unary.operand.ToOperand(codeGen, InstructionUtils.SYS_SIZE);
+
+                codeGen.alloc.SaveScratchRegistersBeforeInlineCall();
+
+                codeGen.Emit(new AssemblyExpr.Unary(unary.instruction, op));
+
+                DeallocVariables(codeGen, (unary.operand, op));
+            }
         }
     }
 }
@@ -67,6 +67,19 @@ public partial class CodeGen : Expr.IVisitor<AssemblyExpr.IValue?>
             }
         }
 
+        public void SaveScratchRegistersBeforeInlineCall()
+        {
+            var cconv = InstructionUtils.GetCallingConvention();
+
+            foreach (var v in registerGraph.GetAliveNodes())
+            {
+                if (v.Priority != Node.NodePriority.High)
+                {
+                    v.SetState(StateUtils.NonVolatileRegisters(cconv));
+                }
+            }
+        }
+
         public void ReserveRegisterAndFree(AssemblyExpr.Register.RegisterName name)
         {
             var node = registerGraph.AllocateNode();
@@ -142,6 +155,27 @@ public partial class CodeGen : Expr.IVisitor<AssemblyExpr.IValue?>
             node?.SetSuggestedRegister(suggested);
         }
 
+        // Lets 'value', moved into the register reserved by 'register', be allocated to the same register, so the move can be removed. The two
+        // only interfere through the reserved register, which nothing else writes while 'value' is alive (see AssemblyParser.MarkBindings).
+        // A value that must survive a call (whose state is the non-volatile registers) is not bound
+        public void BindRegister(AssemblyExpr.IValue register, AssemblyExpr.IValue value)
+        {
+            if (!register.IsRegister(out var reservedRegister) || !value.IsRegister(out var valueRegister)) return;
+
+            Node? reserved = registerGraph.GetNodeForRegister(reservedRegister);
+            Node? node = registerGraph.GetNodeForRegister(valueRegister);
+
+            if (reserved == null || node == null || reserved == node || reserved.State.Length != 1 || node.Priority == Node.NodePriority.High) return;
+
+            var name = reserved.State[0];
+
+            if (node.State.Contains(name))
+            {
+                registerGraph.RemoveEdge(reserved, node);
+                node.SetSuggestedRegister(name);
+            }
+        }
+
         public void ListAccept<T, T2>(List<T> list, Expr.IVisitor<T2> visitor)
             where T : Expr
             where T2 : AssemblyExpr.IValue
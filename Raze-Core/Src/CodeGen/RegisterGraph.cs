@@ -91,6 +91,12 @@ public partial class CodeGen : Expr.IVisitor<AssemblyExpr.IValue?>
             w.connections.Add(v);
         }
 
+        public void RemoveEdge(Node v, Node w)
+        {
+            v.connections.Remove(w);
+            w.connections.Remove(v);
+        }
+
         public IEnumerable<Node> GetAliveNodes()
         {
             foreach (Node node in adj)
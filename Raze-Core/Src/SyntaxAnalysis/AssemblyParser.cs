@@ -16,6 +16,7 @@ public partial class Parser
         List<Expr.InlineAssembly.InlineAssemblyExpr> instructions = [];
 
         Dictionary<string, Expr.InlineAssembly.NamedRegister> namedRegisters = new();
+        Dictionary<Expr.InlineAssembly.NamedRegister, AssemblyExpr.Register.RegisterName> allocatedRegisterNames = new();
 
         public Expr.InlineAssembly ParseInlineAssemblyBlock()
         {
@@ -41,9 +42,63 @@ public partial class Parser
                 instructions.Add(new Expr.InlineAssembly.Free(unfreedRegister.Value));
             }
 
+            MarkBindings();
+
             return new Expr.InlineAssembly(instructions);
         }
 
+        // Registers an instruction writes besides its first operand
+        private static readonly Dictionary<AssemblyExpr.Instruction, AssemblyExpr.Register.RegisterName[]> implicitlyWrittenRegisters = new()
+        {
+            { AssemblyExpr.Instruction.MUL, [AssemblyExpr.Register.RegisterName.RAX, AssemblyExpr.Register.RegisterName.RDX] },
+            { AssemblyExpr.Instruction.DIV, [AssemblyExpr.Register.RegisterName.RAX, AssemblyExpr.Register.RegisterName.RDX] },
+            { AssemblyExpr.Instruction.IDIV, [AssemblyExpr.Register.RegisterName.RAX, AssemblyExpr.Register.RegisterName.RDX] },
+            { AssemblyExpr.Instruction.SYSCALL, [AssemblyExpr.Register.RegisterName.RAX, AssemblyExpr.Register.RegisterName.RCX, AssemblyExpr.Register.RegisterName.R11] },
+        };
+
+        // A MOV of a variable into an allocated register binds the variable to the register, e.g. the arguments of a syscall stub: the variable
+        // may then be allocated to the register, which removes the move. The two then share a register, so the block may write neither after
+        // the MOV: the register is written by no other instruction (including the registers MUL, DIV, IDIV and SYSCALL write), and the variable
+        // is not assigned after the MOV. Blocks with a CALL bind nothing, as the variables must survive it
+        private void MarkBindings()
+        {
+            var asmInstructions = instructions.OfType<Expr.InlineAssembly.Instruction>().ToList();
+
+            if (asmInstructions.Any(x => x is Expr.InlineAssembly.UnaryInstruction { instruction: AssemblyExpr.Instruction.CALL }))
+            {
+                return;
+            }
+
+            for (int i = 0; i < asmInstructions.Count; i++)
+            {
+                if (asmInstructions[i] is not Expr.InlineAssembly.BinaryInstruction { instruction: AssemblyExpr.Instruction.MOV } binary ||
+                    binary.operand2 is not Expr.InlineAssembly.Variable variable ||
+                    binary.operand1 is not Expr.InlineAssembly.NamedRegister register ||
+                    !allocatedRegisterNames.TryGetValue(register, out var name))
+                {
+                    continue;
+                }
+
+                bool registerWritten = asmInstructions.Any(x => x != binary && 
+                    (x.GetOperands().FirstOrDefault() == register || 
+                    (implicitlyWrittenRegisters.TryGetValue(GetInstruction(x), out var written) && written.Contains(name))));
+
+                string variableName = variable.variable.GetLastName().lexeme;
+                bool variableWritten = asmInstructions.Skip(i + 1).Any(x => 
+                    x.GetAssignedVars().Any(assigned => assigned?.variable.GetLastName().lexeme == variableName));
+
+                binary.binding = !registerWritten && !variableWritten;
+            }
+        }
+
+        private static AssemblyExpr.Instruction GetInstruction(Expr.InlineAssembly.Instruction instruction) => instruction switch
+        {
+            Expr.InlineAssembly.BinaryInstruction binary => binary.instruction,
+            Expr.InlineAssembly.UnaryInstruction unary => unary.instruction,
+            Expr.InlineAssembly.NullaryInstruction nullary => nullary.instruction,
+            _ => throw Diagnostics.Panic(new Diagnostic.ImpossibleDiagnostic("Invalid inline assembly instruction"))
+        };
+
         private Expr.InlineAssembly.InlineAssemblyExpr? ParseAssemblyStatement()
         {
             if (parser.ReservedValueMatch("return"))
@@ -91,6 +146,7 @@ public partial class Parser
                     {
                         name = reg.Item1.ToString();
                         namedRegisters[name] = new Expr.InlineAssembly.NamedRegister();
+                        allocatedRegisterNames[namedRegisters[name]] = reg.Item1;
 
                         return new Expr.InlineAssembly.NamedAlloc(namedRegisters[name], reg.Item1, reg.Item2);
                     }
@@ -29,6 +29,8 @@ public abstract partial class Expr
             public AssemblyExpr.Instruction instruction = instruction;
             public Operand operand1 = operand1;
             public Operand operand2 = operand2;
+            // Set by the parser on a MOV binding a variable to an allocated register (see AssemblyParser.MarkBindings)
+            public bool binding = false;
 
             public override void Accept(CodeGen codeGen)
             {
@@ -0,0 +1,171 @@
+import sys
+from typing import List, Tuple
+
+
+# Writes a small PDF laid out like the instruction reference chapters of the Intel SDM (Vol. 2): an outline entry per instruction,
+# ruled opcode tables (including a merged Opcode/Instruction column and a table continued onto the next page), operand encoding tables
+# and text-only pages. Used by the benchmarks and to check extraction backends against each other without the 2000+ page manual
+if len(sys.argv) != 2:
+    print('Usage: make_sample_sdm.py [output.pdf]')
+    exit(65)
+
+file = sys.argv[1]
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 50
+FONT_SIZE = 8
+LINE_HEIGHT = 10
+CELL_PADDING = 3
+
+# (outline title, tables, paragraphs) of each page. The first row of a table is its header, and '\n' breaks a cell's text into lines
+PAGES = [
+    ('Chapter 3 Instruction Set Reference, A-L', [], ['CHAPTER 3', 'INSTRUCTION SET REFERENCE, A-L']),
+    ('ADD—Add', [[
+        ['Opcode', 'Instruction', 'Op/En', '64-bit\nMode', 'Compat/\nLeg Mode', 'Description'],
+        ['04 ib', 'ADD AL, imm8', 'I', 'Valid', 'Valid', 'Add imm8 to AL.'],
+        ['05 iw', 'ADD AX, imm16', 'I', 'Valid', 'Valid', 'Add imm16 to AX.'],
+        ['05 id', 'ADD EAX, imm32', 'I', 'Valid', 'Valid', 'Add imm32 to EAX.'],
+        ['REX.W + 05 id', 'ADD RAX, imm32', 'I', 'Valid', 'N.E.', 'Add imm32 sign-\nextended to 64-bits\nto RAX.'],
+        ['80 /0 ib', 'ADD r/m8, imm8', 'MI', 'Valid', 'Valid', 'Add imm8 to r/m8.'],
+        ['REX + 80 /0 ib', 'ADD r/m8*, imm8', 'MI', 'Valid', 'N.E.', 'Add sign-extended\nimm8 to r/m8.'],
+        ['83 /0 ib', 'ADD r/m32, imm8', 'MI', 'Valid', 'Valid', 'Add sign-extended\nimm8 to r/m32.'],
+        ['00 /r', 'ADD r/m8, r8', 'MR', 'Valid', 'Valid', 'Add r8 to r/m8.'],
+        ['01 /r', 'ADD r/m32, r32', 'MR', 'Valid', 'Valid', 'Add r32 to r/m32.'],
+        ['REX.W + 01 /r', 'ADD r/m64, r64', 'MR', 'Valid', 'N.E.', 'Add r64 to r/m64.'],
+        ['03 /r', 'ADD r32, r/m32', 'RM', 'Valid', 'Valid', 'Add r/m32 to r32.'],
+    ], [
+        ['Op/En', 'Operand 1', 'Operand 2', 'Operand 3', 'Operand 4'],
+        ['RM', 'ModRM:reg (r, w)', 'ModRM:r/m (r)', 'N/A', 'N/A'],
+        ['MR', 'ModRM:r/m (r, w)', 'ModRM:reg (r)', 'N/A', 'N/A'],
+    ]], []),
+    (None, [], ['Description', 'Adds the destination operand (first operand) and the source operand.']),
+    ('ADDSD—Add Scalar Double Precision Floating-Point Value', [[
+        ['Opcode/\nInstruction', 'Op /\nEn', '64/32 bit\nMode\nSupport', 'CPUID\nFeature Flag', 'Description'],
+        ['F2 0F 58 /r\nADDSD xmm1, xmm2/m64', 'A', 'V/V', 'SSE2', 'Add the low double\nprecision value.'],
+        ['VEX.LIG.F2.0F.WIG 58 /r\nVADDSD xmm1, xmm2,\nxmm3/m64', 'B', 'V/V', 'AVX', 'Add the low double\nprecision value.'],
+    ]], []),
+    ('MOV—Move', [[
+        ['Opcode', 'Instruction', 'Op/En', '64-Bit\nMode', 'Compat/\nLeg Mode', 'Description'],
+        ['88 /r', 'MOV r/m8, r8', 'MR', 'Valid', 'Valid', 'Move r8 to r/m8.'],
+        ['89 /r', 'MOV r/m32, r32', 'MR', 'Valid', 'Valid', 'Move r32 to r/m32.'],
+        ['REX.W + 89 /r', 'MOV r/m64, r64', 'MR', 'Valid', 'N.E.', 'Move r64 to r/m64.'],
+        ['8B /r', 'MOV r32, r/m32', 'RM', 'Valid', 'Valid', 'Move r/m32 to r32.'],
+        ['B8+ rd id', 'MOV r32, imm32', 'OI', 'Valid', 'Valid', 'Move imm32 to r32.'],
+        ['REX.W + B8+ rd io', 'MOV r64, imm64', 'OI', 'Valid', 'N.E.', 'Move imm64 to r64.'],
+    ]], []),
+    (None, [[
+        ['Opcode', 'Instruction', 'Op/En', '64-Bit\nMode', 'Compat/\nLeg Mode', 'Description'],
+        ['C6 /0 ib', 'MOV r/m8, imm8', 'MI', 'Valid', 'Valid', 'Move imm8 to r/m8.'],
+        ['C7 /0 id', 'MOV r/m32, imm32', 'MI', 'Valid', 'Valid', 'Move imm32 to r/m32.'],
+        ['REX.W + C7 /0 id', 'MOV r/m64, imm32', 'MI', 'Valid', 'N.E.', 'Move imm32 sign\nextended to 64-bits\nto r/m64.'],
+    ]], ['NOTES:', '* In 64-bit mode, r/m8 can not be encoded to access AH, BH, CH, DH.']),
+    ('MOVSX/MOVSXD—Move With Sign-Extension', [[
+        ['Opcode', 'Instruction', 'Op/En', '64-Bit\nMode', 'Compat/\nLeg Mode', 'Description'],
+        ['0F BE /r', 'MOVSX r16, r/m8', 'RM', 'Valid', 'Valid', 'Move byte to word\nwith sign-extension.'],
+        ['0F BE /r', 'MOVSX r32, r/m8', 'RM', 'Valid', 'Valid', 'Move byte to\ndoubleword with sign-\nextension.'],
+        ['REX.W + 0F BF /r', 'MOVSX r64, r/m16', 'RM', 'Valid', 'N.E.', 'Move word to\nquadword with sign-\nextension.'],
+        ['REX.W + 63 /r', 'MOVSXD r64, r/m32', 'RM', 'Valid', 'N.E.', 'Move doubleword to\nquadword with sign-\nextension.'],
+    ]], []),
+    (None, [], ['Operation', 'DEST := SignExtend(SRC);']),
+    ('SYSCALL—Fast System Call', [[
+        ['Opcode', 'Instruction', 'Op/En', '64-Bit\nMode', 'Compat/\nLeg Mode', 'Description'],
+        ['0F 05', 'SYSCALL', 'ZO', 'Valid', 'Invalid', 'Fast call to privilege\nlevel 0 system\nprocedures.'],
+    ]], []),
+]
+
+def escape(s: str) -> str:
+    return s.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def text(x: float, y: float, s: str, size: int = FONT_SIZE, font: str = 'F1') -> str:
+    return f'BT /{font} {size} Tf {x:.2f} {y:.2f} Td ({escape(s)}) Tj ET\n'
+
+def draw_table(rows: List[List[str]], top: float) -> Tuple[str, float]:
+    column_count = len(rows[0])
+    column_width = (PAGE_WIDTH - 2 * MARGIN) / column_count
+    ops = ''
+
+    ys = [top]
+    for row in rows:
+        ys.append(ys[-1] - max(len(x.split('\n')) for x in row) * LINE_HEIGHT - 2 * CELL_PADDING)
+
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            for l, line in enumerate(cell.split('\n')):
+                ops += text(MARGIN + c * column_width + CELL_PADDING, ys[r] - CELL_PADDING - (l + 1) * LINE_HEIGHT + 2, line, font='F2' if r == 0 else 'F1')
+
+    ops += '0.5 w\n'
+    for y in ys:
+        ops += f'{MARGIN:.2f} {y:.2f} m {MARGIN + column_count * column_width:.2f} {y:.2f} l S\n'
+    for c in range(column_count + 1):
+        ops += f'{MARGIN + c * column_width:.2f} {ys[0]:.2f} m {MARGIN + c * column_width:.2f} {ys[-1]:.2f} l S\n'
+    return ops, ys[-1]
+
+objects: List[bytes] = []
+
+def add_object(body: bytes = b'') -> int:
+    objects.append(body)
+    return len(objects)
+
+def set_object(num: int, body: bytes) -> None:
+    objects[num - 1] = body
+
+catalog = add_object()
+page_tree = add_object()
+outline = add_object()
+regular_font = add_object(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+bold_font = add_object(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>')
+
+pages = []
+titles = []
+for n, (title, tables, paragraphs) in enumerate(PAGES):
+    ops = text(MARGIN, PAGE_HEIGHT - 40, 'INSTRUCTION SET REFERENCE', size=7)
+    y = PAGE_HEIGHT - 70
+    if title:
+        ops += text(MARGIN, y, title, size=11, font='F2')
+        y -= 24
+    for table in tables:
+        table_ops, y = draw_table(table, y)
+        ops += table_ops
+        y -= 24
+    for paragraph in paragraphs:
+        ops += text(MARGIN, y, paragraph, size=9)
+        y -= 14
+    ops += text(PAGE_WIDTH / 2, 30, f'Vol. 2A 3-{n + 1}', size=7)
+
+    data = ops.encode('cp1252')
+    content = add_object(f'<< /Length {len(data)} >>\nstream\n'.encode() + data + b'\nendstream')
+    page = add_object(
+        f'<< /Type /Page /Parent {page_tree} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+        f'/Resources << /Font << /F1 {regular_font} 0 R /F2 {bold_font} 0 R >> >> /Contents {content} 0 R >>'.encode()
+    )
+    pages.append(page)
+    if title:
+        titles.append((title, page))
+
+items = [add_object() for _ in titles]
+for i, ((title, page), item) in enumerate(zip(titles, items)):
+    links = f'/Parent {outline} 0 R'
+    if i > 0:
+        links += f' /Prev {items[i - 1]} 0 R'
+    if i + 1 < len(items):
+        links += f' /Next {items[i + 1]} 0 R'
+    set_object(item, f'<< /Title <FEFF{title.encode("utf-16-be").hex().upper()}> {links} /Dest [{page} 0 R /XYZ null null null] >>'.encode())
+
+set_object(outline, f'<< /Type /Outlines /First {items[0]} 0 R /Last {items[-1]} 0 R /Count {len(items)} >>'.encode())
+set_object(page_tree, f'<< /Type /Pages /Kids [{" ".join(f"{x} 0 R" for x in pages)}] /Count {len(pages)} >>'.encode())
+set_object(catalog, f'<< /Type /Catalog /Pages {page_tree} 0 R /Outlines {outline} 0 R /PageMode /UseOutlines >>'.encode())
+
+output = bytearray(b'%PDF-1.4\n')
+offsets = []
+for i, body in enumerate(objects):
+    offsets.append(len(output))
+    output += f'{i + 1} 0 obj\n'.encode() + body + b'\nendobj\n'
+
+xref = len(output)
+output += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+for offset in offsets:
+    output += f'{offset:010d} 00000 n \n'.encode()
+output += f'trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+
+with open(file, 'wb') as fd:
+    fd.write(output)
@@ -0,0 +1,364 @@
+import os
+import re
+import sys
+import json
+import shutil
+import argparse
+import itertools
+import tempfile
+import subprocess
+from typing import Any, NamedTuple
+
+
+# Compares the encodings the assembler selects from a schema with those of GNU as. Every encoding of the schema is instantiated with
+# representative operands (low and extended registers, memory operands with each displacement size and a SIB byte, small and full-size
+# immediates). Each case is then
+#   - encoded the way the assembler would: the first encoding in schema order that accepts the operands (Encoder.GetEncoding), emitted as
+#     Assembler.VisitBinary/VisitUnary/VisitZero do
+#   - assembled with GNU as (Intel syntax)
+# and every case where the assembler's bytes differ from those of GNU as is reported as JSON. A case the assembler encodes in fewer bytes than
+# GNU as is mis-encoded (e.g. [rsp + disp] without its SIB byte): it is reported as such, fails the --max-wasted gate and is left out of
+# the byte totals
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'GenerateRazeInstructions'))
+
+from operand_types import OperandType, encoding_types, matches
+import table_types
+
+DEFAULT_SCHEMA = os.path.join(ROOT_DIR, '..', '..', '..', 'Src', 'Assembly', 'Assembler', 'Resources', 'EncodingSchema.json')
+ASSEMBLE_FILENAME = 'cases.s'
+OBJECT_FILENAME = 'cases.o'
+TEXT_FILENAME = 'cases.bin'
+# GNU as reports the errors of every line in one pass, but rejecting a line can reveal errors in others (e.g. symbol errors)
+MAX_ASSEMBLE_ATTEMPTS = 5
+
+class CaseOperand(NamedTuple):
+    text: str
+    # As Operand.RegisterOperandType / ToAssemblerOperand pass it to the assembler
+    operand: tuple[OperandType, int]
+    # r8-r15 (or xmm8-xmm15) as the register or the memory operand's base, needing a REX prefix
+    extended: bool = False
+    # SPL/BPL/SIL/DIL/R8B-R15B, only encodable with a REX prefix
+    uniform8Bit: bool = False
+    # Memory operand: its base, and the encoded displacement and SIB sizes
+    base: str | None = None
+    displacement: int = 0
+
+POINTER_SIZES = { 1 : 'BYTE', 2 : 'WORD', 4 : 'DWORD', 8 : 'QWORD', 10 : 'TBYTE', 16 : 'XMMWORD', 32 : 'YMMWORD' }
+REGISTERS = {
+    OperandType.A : { 1 : 'al', 2 : 'ax', 4 : 'eax', 8 : 'rax' },
+    OperandType.C : { 1 : 'cl', 2 : 'cx', 4 : 'ecx', 8 : 'rcx' },
+    OperandType.R : { 1 : 'dl', 2 : 'dx', 4 : 'edx', 8 : 'rdx' },
+}
+EXTENDED_REGISTERS = { 1 : 'r9b', 2 : 'r9w', 4 : 'r9d', 8 : 'r9' }
+VECTOR_REGISTERS = { OperandType.XMM : ('xmm', 16), OperandType.YMM : ('ymm', 32), OperandType.MMX : ('mm', 8) }
+# [base], [base + disp8], [base + disp32], [rsp + disp8] (SIB) and [r9 + disp8] (REX.B)
+MEMORY_OPERANDS = [('rbx', 0), ('rbx', 0x8), ('rbx', 0x1000), ('rsp', 0x8), ('r9', 0x8)]
+IMMEDIATES = { 1 : 0x12, 2 : 0x1234, 4 : 0x12345678, 8 : 0x123456789ABCDEF0 }
+# The ModRM/SIB register code of every register the cases use (r9 and xmm9 are extended by REX)
+REGISTER_CODES = {
+    **{ x : 0 for x in REGISTERS[OperandType.A].values() },
+    **{ x : 1 for x in REGISTERS[OperandType.C].values() },
+    **{ x : 2 for x in REGISTERS[OperandType.R].values() },
+    **{ x : 1 for x in EXTENDED_REGISTERS.values() },
+    **{ name + x : 1 for name, _ in VECTOR_REGISTERS.values() for x in ('1', '9') },
+    'rbx' : 3,
+    'rsp' : 4,
+}
+RSP_CODE = 4
+RBP_CODE = 5
+# SIB byte of [rsp]: scale 1, no index, base rsp
+SIB_NO_INDEX = 0x24
+
+def get_immediate_size(value: int) -> int:
+    return next(x for x in (1, 2, 4, 8) if -(1 << (x * 8 - 1)) <= value < (1 << (x * 8 - 1)))
+
+def get_register_operands(operandType: OperandType, size: int) -> list[CaseOperand]:
+    if operandType in VECTOR_REGISTERS:
+        name, vectorSize = VECTOR_REGISTERS[operandType]
+        return [CaseOperand(name + '1', (operandType, vectorSize))] + ([] if operandType == OperandType.MMX else [CaseOperand(name + '9', (operandType, vectorSize), True)])
+    if operandType in (OperandType.A, OperandType.C):
+        return [CaseOperand(REGISTERS[operandType][size], (operandType, size))]
+    return [
+        CaseOperand(REGISTERS[OperandType.R][size], (OperandType.R, size)),
+        CaseOperand(EXTENDED_REGISTERS[size], (OperandType.R, size), True, size == 1)
+    ]
+
+def get_memory_operands(size: int) -> list[CaseOperand]:
+    pointer = POINTER_SIZES[size] + ' PTR ' if size in POINTER_SIZES else ''
+    return [
+        CaseOperand(f'{pointer}[{base}{f"+{hex(displacement)}" if displacement else ""}]', (OperandType.M, size), base == 'r9', False, base, displacement)
+        for base, displacement in MEMORY_OPERANDS
+    ]
+
+# The representative operands an encoding's operand is instantiated with, or None if the benchmark does not cover the operand
+def get_case_operands(schemaOperand: tuple[OperandType, int]) -> list[CaseOperand] | None:
+    schemaType, size = schemaOperand
+    result: list[CaseOperand] = []
+
+    if (OperandType.IMM & schemaType) == schemaType:
+        if schemaType == OperandType.One:
+            return [CaseOperand('1', (OperandType.IMM, 1))]
+        values = sorted({ 1, IMMEDIATES[size] }) if size in IMMEDIATES else []
+        return [CaseOperand(hex(x), (OperandType.IMM, get_immediate_size(x))) for x in values] or None
+
+    registerType = schemaType & ~OperandType.M
+    if registerType:
+        if registerType in VECTOR_REGISTERS:
+            result += get_register_operands(registerType, size)
+        elif registerType in (OperandType.R, OperandType.A, OperandType.C) and size in EXTENDED_REGISTERS:
+            result += get_register_operands(registerType, size)
+        else:
+            return None
+    if schemaType & OperandType.M:
+        result += get_memory_operands(size)
+    return result
+
+# Mirrors Encoding.SpecialMatch for the case's operands (literals are all positive integers)
+def special_match(encoding: table_types.Encoding, case: tuple[CaseOperand, ...]) -> bool:
+    encodingType = encoding.encodingType
+    if encodingType & (encoding_types['RepPrefix'] | encoding_types['RepnePrefix']):
+        return False
+    for operand, schemaOperand in zip(case, encoding.operands):
+        if schemaOperand.get_schema_operand()[0] == OperandType.One and operand.text != '1':
+            return False
+    if not encodingType & encoding_types['NoUpper8BitEncoding'] and any(x.operand == (OperandType.R, 1) and (x.uniform8Bit or x.extended) for x in case):
+        return False
+    return True
+
+# Mirrors Encoder.GetEncoding
+def select_encoding(encodings: list[table_types.Encoding], case: tuple[CaseOperand, ...]) -> table_types.Encoding | None:
+    for encoding in encodings:
+        if len(encoding.operands) != len(case) or encoding.vex is not None:
+            continue
+        if all(matches(x.operand, y.get_schema_operand()) for x, y in zip(case, encoding.operands)) and special_match(encoding, case):
+            return encoding
+    return None
+
+def to_immediate(value: int, size: int) -> bytes:
+    return value.to_bytes(size, 'little', signed=value < 0)
+
+def encode_modrm(mod: int, reg: int, rm: int) -> bytes:
+    return bytes([mod << 6 | reg << 3 | rm])
+
+# Mirrors EncodingUtils.EncodeMemoryOperand for [base] and [base + displacement]. Like the assembler, [rsp + displacement] is emitted
+# without the SIB byte it needs, which GNU as reports as shorter
+def encode_memory_operand(operand: CaseOperand, reg: int) -> list[bytes]:
+    base = REGISTER_CODES[operand.base]
+    if operand.displacement == 0:
+        if base == RBP_CODE:
+            return [encode_modrm(0b01, reg, base), bytes(1)]
+        if base == RSP_CODE:
+            return [encode_modrm(0b00, reg, base), bytes([SIB_NO_INDEX])]
+        return [encode_modrm(0b00, reg, base)]
+    displacement = to_immediate(operand.displacement, 1 if get_immediate_size(operand.displacement) == 1 else 4)
+    return [encode_modrm(0b01 if len(displacement) == 1 else 0b10, reg, base), displacement]
+
+# The case as the assembler emits it with the encoding (Assembler.VisitBinary/VisitUnary/VisitZero):
+#   [0x66] [REX] opcode [ModRM] [SIB] [displacement] [immediate], or only the opcode for instructions without operands
+def encode_case(encoding: table_types.Encoding, case: tuple[CaseOperand, ...]) -> bytes:
+    opCode = bytearray(encoding.opCode)
+    if not case:
+        return bytes(opCode)
+
+    encodingType = encoding.encodingType
+    schemaOperands = [x.get_schema_operand() for x in encoding.operands]
+    extension = max(encoding.opCodeExtension, 0)
+    result = bytearray()
+
+    if encodingType & encoding_types['SizePrefix']:
+        result.append(0x66)
+
+    # EncodingUtils.SetRexPrefix
+    rexW = bool(encodingType & encoding_types['RexWPrefix'])
+    rexR, rexB = (False, case[0].extended) if len(case) == 1 else (case[0].extended, case[1].extended)
+    if len(case) == 2 and (schemaOperands[0][0] & OperandType.M or (schemaOperands[1][0] & OperandType.IMM) == OperandType.IMM):
+        rexR, rexB = rexB, rexR
+    if encodingType & (encoding_types['RexPrefix'] | encoding_types['RexWPrefix']) or rexR or rexB:
+        result.append(0x40 | rexW << 3 | rexR << 2 | rexB)
+
+    registers = [REGISTER_CODES[x.text] for x in case if x.base is None and x.operand[0] != OperandType.IMM]
+    memory = next((x for x in case if x.base is not None), None)
+    immediates = [to_immediate(int(x.text, 0), size) for x, (_, size) in zip(case, schemaOperands) if x.operand[0] == OperandType.IMM]
+
+    if encodingType & encoding_types['AddRegisterToOpCode'] and registers:
+        opCode[-1] = (opCode[-1] & 0xF8) | registers[0]
+
+    # The operand's instructions, the first being the ModRM byte
+    if memory is not None:
+        operandBytes = encode_memory_operand(memory, registers[0] if registers else extension)
+    elif len(registers) == 2:
+        reg1, reg2 = registers[::-1] if schemaOperands[0][0] & OperandType.M else registers
+        operandBytes = [encode_modrm(0b11, reg1, reg2)]
+    elif registers:
+        operandBytes = [encode_modrm(0b11, extension, registers[0])]
+    else:
+        operandBytes = []
+    operandBytes += immediates
+
+    if encodingType & encoding_types['NoModRegRM']:
+        operandBytes = operandBytes[1:]
+
+    return bytes(result + opCode + b''.join(operandBytes))
+
+def get_cases(instructions: table_types.instruction_table) -> list[tuple[str, tuple[CaseOperand, ...]]]:
+    cases: dict[tuple[str, tuple[str, ...]], tuple[str, tuple[CaseOperand, ...]]] = {}
+
+    for mnemonic, encodings in instructions.items():
+        for encoding in encodings:
+            # Label operands and VEX encodings are not assembled from the schema's operands
+            if encoding.encodingType & encoding_types['RelativeJump'] or encoding.vex is not None:
+                continue
+
+            operands = [get_case_operands(x.get_schema_operand()) for x in encoding.operands]
+            if any(x is None for x in operands):
+                continue
+
+            for case in itertools.product(*operands):
+                cases.setdefault((mnemonic, tuple(x.text for x in case)), (mnemonic, case))
+
+    return list(cases.values())
+
+def to_assembly(mnemonic: str, case: tuple[CaseOperand, ...]) -> str:
+    return mnemonic.lower() + (' ' + ', '.join(x.text for x in case) if case else '')
+
+# Assembles every case with GNU as, returning the bytes of each case (None if as rejected it, with the error)
+def assemble(lines: list[str], assembler: str, objcopy: str, nm: str, cwd: str) -> list[tuple[bytes | None, str | None]]:
+    results: list[tuple[bytes | None, str | None]] = [(None, None)] * len(lines)
+    rejected: dict[int, str] = {}
+
+    for _ in range(MAX_ASSEMBLE_ATTEMPTS):
+        source = ['.intel_syntax noprefix', '.text']
+        numbers: dict[int, int] = {}
+        for idx, line in enumerate(lines):
+            if idx not in rejected:
+                numbers[len(source) + 1] = idx
+                source.append(f'case_{idx}: {line}')
+        source.append(f'case_end:')
+
+        with open(os.path.join(cwd, ASSEMBLE_FILENAME), 'w') as fd:
+            fd.write('\n'.join(source) + '\n')
+
+        process = subprocess.run([assembler, '--64', '-o', OBJECT_FILENAME, ASSEMBLE_FILENAME], cwd=cwd, capture_output=True, text=True)
+        if process.returncode == 0:
+            break
+
+        errors = re.findall(rf'{re.escape(ASSEMBLE_FILENAME)}:(\d+): Error: (.*)', process.stderr)
+        if not errors or not any(int(x) in numbers for x, _ in errors):
+            raise Exception('GNU as failed: ' + process.stderr)
+        for number, error in errors:
+            if int(number) in numbers:
+                rejected.setdefault(numbers[int(number)], error)
+    else:
+        raise Exception(f'GNU as still failed after {MAX_ASSEMBLE_ATTEMPTS} attempts')
+
+    subprocess.run([objcopy, '-O', 'binary', '-j', '.text', OBJECT_FILENAME, TEXT_FILENAME], cwd=cwd, check=True)
+    with open(os.path.join(cwd, TEXT_FILENAME), 'rb') as fd:
+        text = fd.read()
+
+    symbols = subprocess.run([nm, '-n', OBJECT_FILENAME], cwd=cwd, capture_output=True, text=True, check=True).stdout
+    addresses = [(int(address, 16), name) for address, _, name in (x.split() for x in symbols.splitlines())]
+    for (address, name), (next_address, _) in zip(addresses, addresses[1:]):
+        if name.startswith('case_') and name != 'case_end':
+            results[int(name[len('case_'):])] = (text[address:next_address], None)
+
+    for idx, error in rejected.items():
+        results[idx] = (None, error)
+    return results
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA, help='JSON encoding schema to check (default: the schema the compiler is built with)')
+    parser.add_argument('--as', dest='assembler', default='as', help='GNU as executable')
+    parser.add_argument('--objcopy', default='objcopy', help='objcopy executable, to extract the assembled bytes')
+    parser.add_argument('--nm', default='nm', help='nm executable, to find each case in the assembled code')
+    parser.add_argument('--mnemonics', nargs='+', metavar='MNEMONIC', help='Only check these mnemonics')
+    parser.add_argument('--output', help='Write the report as JSON to this file instead of stdout')
+    parser.add_argument('--max-wasted', type=int, metavar='BYTES', help='Exit with 1 if the assembler mis-encodes a case or emits more than BYTES bytes more than GNU as in total')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_arguments()
+    for tool in [args.assembler, args.objcopy, args.nm]:
+        if shutil.which(tool) is None:
+            print(f'{tool} not found', file=sys.stderr)
+            exit(1)
+
+    with open(args.schema) as fd:
+        instructions = table_types.from_json(json.load(fd))
+    if args.mnemonics:
+        instructions = { k : v for k, v in instructions.items() if k in args.mnemonics }
+
+    cases = get_cases(instructions)
+    with tempfile.TemporaryDirectory() as cwd:
+        assembled = assemble([to_assembly(*x) for x in cases], args.assembler, args.objcopy, args.nm, cwd)
+
+    summary: dict[str, int] = { x : 0 for x in ['cases', 'same', 'longer', 'misencoded', 'different', 'rejected', 'unmatched', 'raze_bytes', 'gnu_bytes', 'bytes_wasted'] }
+    report: list[dict[str, Any]] = []
+
+    for (mnemonic, case), (code, error) in zip(cases, assembled):
+        summary['cases'] += 1
+        entry: dict[str, Any] = { 'instruction' : to_assembly(mnemonic, case) }
+
+        encoding = select_encoding(instructions[mnemonic], case)
+        if encoding is not None:
+            entry['encoding'] = encoding.get_instruction()
+            entry['opcode'] = encoding.get_opcode()
+            raze_code = encode_case(encoding, case)
+            entry['raze_size'] = len(raze_code)
+            entry['raze_bytes'] = raze_code.hex(' ').upper()
+
+        if code is None:
+            summary['rejected'] += 1
+            report.append({ **entry, 'status' : 'rejected', 'error' : error })
+            continue
+        entry['gnu_size'] = len(code)
+        entry['gnu_bytes'] = code.hex(' ').upper()
+
+        if encoding is None:
+            summary['unmatched'] += 1
+            report.append({ **entry, 'status' : 'unmatched' })
+            continue
+
+        if len(raze_code) < len(code):
+            summary['misencoded'] += 1
+            report.append({ **entry, 'status' : 'misencoded' })
+            continue
+
+        summary['raze_bytes'] += len(raze_code)
+        summary['gnu_bytes'] += len(code)
+
+        if len(raze_code) > len(code):
+            status = 'longer'
+            summary['bytes_wasted'] += len(raze_code) - len(code)
+        elif raze_code != code:
+            status = 'different'
+        else:
+            summary['same'] += 1
+            continue
+
+        summary[status] += 1
+        report.append({ **entry, 'status' : status })
+
+    result = {
+        'schema' : os.path.relpath(os.path.abspath(args.schema), BENCHMARK_DIR),
+        'assembler' : subprocess.run([args.assembler, '--version'], capture_output=True, text=True).stdout.splitlines()[0],
+        'summary' : summary,
+        'cases' : report
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(result, output, indent=4)
+    else:
+        print(json.dumps(result, indent=4))
+
+    print(', '.join(f'{k}: {v}' for k, v in summary.items()), file=sys.stderr)
+    if args.max_wasted is not None:
+        if summary['misencoded']:
+            print(f"REGRESSION: {summary['misencoded']} cases mis-encoded", file=sys.stderr)
+        if summary['bytes_wasted'] > args.max_wasted:
+            print(f"REGRESSION: {summary['bytes_wasted']} bytes wasted, more than {args.max_wasted}", file=sys.stderr)
+        if summary['misencoded'] or summary['bytes_wasted'] > args.max_wasted:
+            exit(1)
@@ -0,0 +1,214 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import threading
+import subprocess
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+
+# Times each stage of the instruction generator pipeline (extract -> corrections.sh -> parse_instruction_table.py, which also validates the schema)
+# on the checked-in fixtures, and writes the wall time, peak RSS and rows per second of every stage as JSON.
+# The extract stage scrapes the sample SDM pages. The later stages run on the sample instructions.tsv, which covers every instruction the compiler needs
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+FIXTURES_DIR = os.path.join(BENCHMARK_DIR, 'Fixtures')
+SAMPLE_PDF = os.path.join(FIXTURES_DIR, 'sample_sdm.pdf')
+SAMPLE_TABLE = os.path.join(FIXTURES_DIR, 'sample_instructions.tsv')
+
+EXTRACT_SCRIPT = os.path.join(ROOT_DIR, 'GenerateInstructionTable', 'generate_instruction_table.py')
+CORRECTIONS_SCRIPT = os.path.join(ROOT_DIR, 'GenerateInstructionTable', 'corrections.sh')
+PARSE_SCRIPT = os.path.join(ROOT_DIR, 'GenerateRazeInstructions', 'parse_instruction_table.py')
+
+STAGES = ['extract', 'corrections', 'parse']
+PYTHON_STAGES = ['extract', 'parse']
+TABLE_FILENAME = 'instructions.tsv'
+SCHEMA_FILENAME = 'output.json'
+# Interval of the peak RSS sampling, in seconds
+RSS_SAMPLE_INTERVAL = 0.002
+# Fraction a stage's median wall time or peak RSS may grow by over the baseline before it counts as a regression
+REGRESSION_TOLERANCE = 0.25
+
+class StageResult:
+    def __init__(self, name: str, rows: int) -> None:
+        self.name = name
+        self.rows = rows
+        self.wall_times: List[float] = []
+        self.peak_rss_kb = 0
+
+    def to_json(self) -> Dict[str, Any]:
+        median = statistics.median(self.wall_times)
+        return {
+            'stage' : self.name,
+            'runs' : len(self.wall_times),
+            'wall_s' : round(median, 6),
+            'wall_s_min' : round(min(self.wall_times), 6),
+            'wall_s_max' : round(max(self.wall_times), 6),
+            'peak_rss_kb' : self.peak_rss_kb,
+            'rows' : self.rows,
+            'rows_per_s' : round(self.rows / median, 2) if median else None
+        }
+
+def count_rows(table: str) -> int:
+    with open(table, 'r', encoding="utf-8") as fd:
+        return max(sum(1 for _ in fd) - 1, 0)
+
+def python_command(script: str, args: List[str], profile: Optional[str]) -> List[str]:
+    if profile is None:
+        return [sys.executable, script] + args
+    return [sys.executable, '-m', 'cProfile', '-o', profile, script] + args
+
+def get_process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    for x in pids:
+        try:
+            with open(f'/proc/{x}/task/{x}/children') as fd:
+                pids += [int(y) for y in fd.read().split()]
+        except OSError:
+            pass
+    return pids
+
+def get_peak_rss_kb(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status') as fd:
+            for line in fd:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+# The rusage of a spawned child also counts the parent's memory it shared before exec, so the peak RSS of a stage is instead sampled from /proc
+# while it runs, as the largest combined high-water mark of the stage's process and its subprocesses (e.g. extraction workers)
+class RssSampler(threading.Thread):
+    def __init__(self, pid: int) -> None:
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.peak_rss_kb = 0
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        while not self.done.is_set():
+            self.peak_rss_kb = max(self.peak_rss_kb, sum(get_peak_rss_kb(x) for x in get_process_tree(self.pid)))
+            self.done.wait(RSS_SAMPLE_INTERVAL)
+
+# Runs one stage as a child process, returning its wall time and peak RSS (KB). Each stage gets a fresh interpreter (and JVM),
+# so the timings include startup costs, as they do in generateInstructionTable.sh
+def run(command: List[str], cwd: str, stdout: str) -> tuple[float, int]:
+    with open(stdout, 'w') as output, open(os.path.join(cwd, 'stderr.log'), 'a') as error:
+        start = perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, stdout=output, stderr=error)
+        sampler = RssSampler(process.pid)
+        sampler.start()
+        returncode = process.wait()
+        wall_time = perf_counter() - start
+        sampler.done.set()
+        sampler.join()
+
+    if returncode != 0:
+        raise Exception(f"Stage failed ({returncode}): {' '.join(command)}. See {os.path.join(cwd, 'stderr.log')}")
+    return wall_time, sampler.peak_rss_kb
+
+def run_stage(stage: str, args: argparse.Namespace, cwd: str, iteration: int) -> tuple[float, int]:
+    profile = None
+    if args.profile and stage in PYTHON_STAGES:
+        profile = os.path.join(args.profile, f'{stage}.prof' if iteration == 0 else f'{stage}.{iteration}.prof')
+    log = os.path.join(cwd, f'{stage}.log')
+
+    match stage:
+        case 'extract':
+            return run(python_command(EXTRACT_SCRIPT, [args.pdf, '--no-cache', '--backend', args.backend, '--workers', str(args.workers)], profile), cwd, log)
+        case 'corrections':
+            # corrections.sh rewrites the table in place, so every run starts from a fresh copy
+            shutil.copyfile(args.table, os.path.join(cwd, TABLE_FILENAME))
+            return run(['bash', CORRECTIONS_SCRIPT], cwd, log)
+        case 'parse':
+            return run(python_command(PARSE_SCRIPT, [TABLE_FILENAME, '--output', SCHEMA_FILENAME], profile), cwd, log)
+    raise Exception("Unrecognized stage: " + stage)
+
+# Stages after extract run on the sample table rather than the extracted one, so each stage can also be benchmarked on its own
+def prepare_stage(stage: str, args: argparse.Namespace, cwd: str) -> None:
+    if stage == 'parse':
+        shutil.copyfile(args.table, os.path.join(cwd, TABLE_FILENAME))
+
+def get_regressions(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    previous = { x['stage'] : x for x in baseline['stages'] }
+
+    for result in results:
+        if result['stage'] not in previous:
+            continue
+        for metric in ['wall_s', 'peak_rss_kb']:
+            old, new = previous[result['stage']][metric], result[metric]
+            if old and new > old * (1 + tolerance):
+                regressions.append(f"{result['stage']}.{metric}: {old} -> {new} (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES, help='Stages to run, in pipeline order')
+    parser.add_argument('--pdf', default=SAMPLE_PDF, help='SDM pages scraped by the extract stage')
+    parser.add_argument('--table', default=SAMPLE_TABLE, help='instructions.tsv fed to the corrections and parse stages')
+    parser.add_argument('--backend', default='tabula', help='Table extraction backend of the extract stage')
+    parser.add_argument('--workers', type=int, default=1, help='Number of extraction processes of the extract stage')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of times each stage is run. The median wall time is reported')
+    parser.add_argument('--profile', metavar='DIR', help='Write a cProfile .prof file for each run of the Python stages to DIR')
+    parser.add_argument('--output', help='Write the results as JSON to this file instead of stdout')
+    parser.add_argument('--baseline', help='Results of a previous run. Exits with 1 if a stage regressed beyond --tolerance')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE, help='Allowed relative growth of wall time and peak RSS over --baseline')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_arguments()
+    args.pdf = os.path.abspath(args.pdf)
+    args.table = os.path.abspath(args.table)
+    if args.profile:
+        args.profile = os.path.abspath(args.profile)
+        os.makedirs(args.profile, exist_ok=True)
+
+    stages = [x for x in STAGES if x in args.stages]
+    results = []
+
+    with tempfile.TemporaryDirectory() as cwd:
+        for stage in stages:
+            prepare_stage(stage, args, cwd)
+
+            result = StageResult(stage, 0)
+            for i in range(args.repeat):
+                wall_time, peak_rss_kb = run_stage(stage, args, cwd, i)
+                result.wall_times.append(wall_time)
+                result.peak_rss_kb = max(result.peak_rss_kb, peak_rss_kb)
+
+            result.rows = count_rows(os.path.join(cwd, TABLE_FILENAME))
+            results.append(result.to_json())
+            print(f"{stage}: {results[-1]['wall_s']:.3f}s, {results[-1]['peak_rss_kb'] / 1024:.1f} MB, {results[-1]['rows_per_s']} rows/s", file=sys.stderr)
+
+    report = {
+        'python' : platform.python_version(),
+        'platform' : platform.platform(),
+        'cpus' : os.cpu_count(),
+        'pdf' : os.path.relpath(args.pdf, BENCHMARK_DIR),
+        'table' : os.path.relpath(args.table, BENCHMARK_DIR),
+        'backend' : args.backend,
+        'workers' : args.workers,
+        'stages' : results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    if args.baseline:
+        with open(args.baseline) as fd:
+            regressions = get_regressions(results, json.load(fd), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION: ' + regression, file=sys.stderr)
+        if regressions:
+            exit(1)
@@ -0,0 +1,50 @@
+import sys
+import csv
+import difflib
+import argparse
+from typing import List
+
+
+# Compares two instructions.tsv files row by row, e.g. the output of the tabula and native extraction backends.
+# Exits with 1 if they differ
+
+def read_rows(file: str) -> List[str]:
+    with open(file, 'r', newline='', encoding="utf-8") as inp:
+        return ['\t'.join(row) for row in csv.reader(inp, delimiter='\t')]
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('a', metavar='a.tsv', help='Reference table, e.g. scraped with --backend tabula')
+    parser.add_argument('b', metavar='b.tsv', help='Table to compare against the reference, e.g. scraped with --backend native')
+    parser.add_argument('--context', type=int, default=0, help='Number of unchanged rows printed around each difference')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_arguments()
+
+    a = read_rows(args.a)
+    b = read_rows(args.b)
+
+    missing = extra = changed = 0
+    for group in difflib.SequenceMatcher(None, a, b, autojunk=False).get_grouped_opcodes(args.context):
+        i1, i2, j1, j2 = group[0][1], group[-1][2], group[0][3], group[-1][4]
+        print(f'@@ {args.a}:{i1 + 1}-{i2} {args.b}:{j1 + 1}-{j2} @@')
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for row in a[i1:i2]:
+                    print('  ' + row)
+                continue
+
+            for row in a[i1:i2]:
+                print('- ' + row)
+            for row in b[j1:j2]:
+                print('+ ' + row)
+
+            if tag == 'replace':
+                changed += min(i2 - i1, j2 - j1)
+            missing += max(0, (i2 - i1) - (j2 - j1)) if tag == 'replace' else i2 - i1
+            extra += max(0, (j2 - j1) - (i2 - i1)) if tag == 'replace' else j2 - j1
+
+    print(f'Rows: {len(a)} / {len(b)}, Changed: {changed}, Missing: {missing}, Extra: {extra}')
+    sys.exit(1 if changed or missing or extra else 0)
@@ -0,0 +1,67 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+from pandas import DataFrame
+from table_cache import TableCache
+
+
+# 'tabula' runs tabula-java's lattice mode and needs a Java runtime. 'native' reads the PDF with pdfplumber and needs no JVM
+BACKENDS = ['tabula', 'native']
+DEFAULT_BACKEND = 'tabula'
+BACKEND_PACKAGES = { 'tabula' : 'tabula-py', 'native' : 'pdfplumber' }
+
+# Any change to these invalidates previously cached tables
+def get_extractor_settings(backend: str) -> Dict[str, str]:
+    return { 'extractor' : backend, 'version' : version(BACKEND_PACKAGES[backend]), 'lattice' : True, 'pandas' : pd.__version__ }
+
+# Backends are imported on first use, so only the selected one has to be installed
+def read_pdf(file: str, pages: int | List[int], backend: str) -> List[DataFrame]:
+    if backend == 'tabula':
+        import tabula
+        return tabula.read_pdf(file, pages=pages, lattice=True)
+    if backend == 'native':
+        import native_tables
+        return native_tables.read_pdf(file, pages)
+    raise Exception("Unrecognized extraction backend: " + backend)
+
+# Bounds the number of extracted shards held in memory at once
+MAX_PENDING_SHARDS_PER_WORKER = 2
+
+def get_shards(pages: List[int], shard_size: int) -> List[List[int]]:
+    return [pages[i:i+shard_size] for i in range(0, len(pages), shard_size)]
+
+def extract_shard(file: str, pages: List[int], cache: Optional[TableCache], backend: str) -> List[DataFrame]:
+    # With the tabula backend, each worker process starts its own JVM on the first call to read_pdf
+    if cache is None:
+        return read_pdf(file, pages, backend)
+
+    # tabula does not report which page a table came from, so cached extraction runs one page at a time
+    tables = []
+    for page in pages:
+        page_tables = cache.get(page)
+        if page_tables is None:
+            page_tables = read_pdf(file, page, backend)
+            cache.put(page, page_tables)
+        tables += page_tables
+    return tables
+
+def extract_tables(file: str, pages: List[int], workers: int, shard_size: int, cache: Optional[TableCache] = None, backend: str = DEFAULT_BACKEND) -> Iterator[DataFrame]:
+    shards = get_shards(pages, shard_size)
+
+    if workers == 1:
+        for shard in shards:
+            yield from extract_shard(file, shard, cache, backend)
+        return
+
+    # Shards are submitted through a bounded window and consumed in submission (page) order, so the merged table order matches a serial run
+    # and peak memory does not grow with the number of pages
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(extract_shard, file, shard, cache, backend))
+            if len(pending) >= workers * MAX_PENDING_SHARDS_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
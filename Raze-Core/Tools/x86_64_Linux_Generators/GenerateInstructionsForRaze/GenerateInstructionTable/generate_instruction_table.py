@@ -1,23 +1,24 @@
-import sys
+import os
+import argparse
 from typing import List, Dict
-from tabula import read_pdf 
 from tabulate import tabulate 
 import pandas as pd
 from pandas import DataFrame, Series
 import csv
 import re
+from extract_tables import extract_tables, get_extractor_settings, BACKENDS, DEFAULT_BACKEND
+from table_cache import TableCache, hash_file
+from page_index import get_opcode_table_pages
 
 
-if len(sys.argv) != 2:
-    print('Usage: generateInstructions.py [Intel® 64 and IA-32 Architectures Software Developer\'s Manual Combined Volumes 2A, 2B, 2C, and 2D: Instruction Set Reference, A-Z]')
-    exit(65)
-
 def to_header(raw_header: str) -> str:
     return re.sub('[^a-zA-Z]+', '', raw_header).lower()
 
-file = sys.argv[1]
 PAGE_BEGIN = 118
 PAGE_END = 2341
+SHARD_SIZE = 50
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'raze', 'sdm_tables')
+CACHE_SIZE_MB = 512
 TABLE_HEADER_0_START='Opcode'
 pd.set_option('display.max_colwidth', None)
 EXPORT_DESCRIPTIONS=False
@@ -27,8 +28,6 @@ FORMATTED_HEADERS = [to_header(header) for header in HEADERS]
 NO_DATA=''
 OUTPUT_FILENAME = 'instructions.tsv'
 
-df: DataFrame = read_pdf(file, pages=f'{PAGE_BEGIN}-{PAGE_END}', lattice=True)
-
 to_flags = {
     x : {} for x in FORMATTED_HEADERS
 }
@@ -62,8 +61,9 @@ to_flags['opcode'] = [
     (r'\s*\+\s*(r[bowd])', '', r'+\1'),
     ('/05', '', '/5'),
     ('01/7', '', '01 /7'),
-    ('0F3A', '', '0F 3A'),
-    ('0F38', '', '0F 38'),
+    # Not within a VEX prefix, whose opcode map field is written as 0F38/0F3A (e.g. VEX.128.66.0F38.W0)
+    (r'(?<!\.)0F3A', '', '0F 3A'),
+    (r'(?<!\.)0F38', '', '0F 38'),
     ('ib1', '', 'ib'),
     (r'([0-9])/r', '', r'\1 /r')
 ]
@@ -96,64 +96,90 @@ def format_bitmode_val(value):
         '' : ''
     }[to_header(value)]
 
-def add_to_instructions(instructions: List[Dict[str, str]], idx: int, header: str, value: str):
-    
+def format_bitmode(value: str) -> str:
+    return '/'.join([format_bitmode_val(x) for x in value.split('/')])
+
+# The rules of each header are applied in order, so a value can be rewritten by several of them in turn. The combined pattern only selects
+# the rows to rewrite: a value that matches none of a header's rules is left untouched by all of them
+compiled_flags = {
+    header : (re.compile('|'.join(f'(?:{k})' for k, _, _ in rules)), [(re.compile(k), v, r) for k, v, r in rules])
+    for header, rules in to_flags.items() if rules
+}
+
+def add_to_instructions(instructions: List[Dict[str, str]], header: str, values: Series):
+    if values.empty:
+        return
+
     if header == 'instruction':
-        value, *operands = value.split(' ', maxsplit=1)
-        if operands:
-            value += ' ' + ', '.join([x.strip() for x in operands[0].split(',')])
+        parts = values.str.partition(' ')
+        values = parts[0] + parts[1] + parts[2].str.strip().str.replace(r'\s*,\s*', ', ', regex=True)
     if header == 'bitmodesupport':
-        value = '/'.join([format_bitmode_val(x) for x in value.split('/')])
+        values = values.map(format_bitmode)
+
+    if PARSE_FLAGS and header in compiled_flags:
+        combined, rules = compiled_flags[header]
+        matched = values[values.str.count(combined) > 0]
 
-    if PARSE_FLAGS:
-        for k, v, r in to_flags[header]:
-            value, n = re.subn(k, r, value)
+        for k, v, r in rules:
+            hits = matched.index[matched.str.count(k) > 0]
+            matched[hits] = matched[hits].str.replace(k, r, regex=True)
 
-            if n and v not in instructions[idx]['flags']:
-                instructions[idx]['flags'] += (v + ', ') if v else ''
+            if v:
+                for idx in hits:
+                    if v not in instructions[idx]['flags']:
+                        instructions[idx]['flags'] += v + ', '
+
+        values = values.copy()
+        values[matched.index] = matched
 
     if not EXPORT_DESCRIPTIONS and header == 'description':
         return
-    
-    instructions[idx][header] = value
+
+    for idx, value in values.items():
+        instructions[idx][header] = value
     
 aliases = { 'cpuid' : 'cpuidfeatureflag', 'bitmode' : 'bitmodesupport' }
 
-def add_item(instructions: List[Dict[str, str]], idx: int, item: List[str], header: str, series: Series):
-
-    value = ' '.join(item)
+def add_column(instructions: List[Dict[str, str]], values: Series, header: str, series: Series):
 
     if header in aliases:
         header = aliases[header]
     
     if header in FORMATTED_HEADERS:
-        if header == 'bitmodesupport' and value == 'VV':
-            value = 'V/V'
+        if header == 'bitmodesupport':
+            values = values.replace('VV', 'V/V')
             
-        add_to_instructions(instructions, idx, header, value)
+        add_to_instructions(instructions, header, values)
         return
     elif header == 'opcodeinstruction':
-        dataIdx = str(series.astype(str)).split('\n')[idx].lstrip('0123456789').strip().find('\\r')
-        data = [value[:dataIdx], value[dataIdx+1:]]
+        # The opcode and instruction are separated by a line break, which only survives in the column's printed form
+        lines = str(series.astype(str)).split('\n')
+        dataIdx = [lines[idx].lstrip('0123456789').strip().find('\\r') for idx in values.index]
+        data = [
+            Series([value[:i] for value, i in zip(values, dataIdx)], dtype=object),
+            Series([value[i+1:] for value, i in zip(values, dataIdx)], dtype=object)
+        ]
         
-        add_to_instructions(instructions, idx, 'opcode', data[0])
-        add_to_instructions(instructions, idx, 'instruction', data[1])
+        add_to_instructions(instructions, 'opcode', data[0])
+        add_to_instructions(instructions, 'instruction', data[1])
         return
     elif header == 'modesupport':
-        instructions[idx]['bitmodesupport'] = value
+        for idx, value in values.items():
+            instructions[idx]['bitmodesupport'] = value
         return
     elif header == 'compatlegmode':
-        if value != 'N/A':
-            add_to_instructions(instructions, idx, 'bitmodesupport', instructions[idx]['bitmodesupport'] + '/' + value)
+        values = values[values != 'N/A']
+        add_to_instructions(instructions, 'bitmodesupport', Series([instructions[idx]['bitmodesupport'] for idx in values.index], index=values.index, dtype=object) + '/' + values)
         return
     elif header == 'description':
-        add_to_instructions(instructions, idx, header, value)
+        add_to_instructions(instructions, header, values)
         return
     elif header == 'unnamed':
         return
     
-    print(series.astype(str).str.split())
-    raise Exception("Unrecognized header type: " + header)
+    if not values.empty:
+        print(series.astype(str).str.split())
+        raise Exception("Unrecognized header type: " + header)
 
 def get_instructions_from_table(table: DataFrame) -> List[Dict[str, str]]: 
     instructions = []
@@ -161,15 +187,14 @@ def get_instructions_from_table(table: DataFrame) -> List[Dict[str, str]]:
     for row in table:
         series = table[row]
         header = to_header(row)
-        idx = 0
-        for item in series.astype(str).str.split():
-            if ''.join(item).lower() in ['notes:', 'nan']:
-                continue
-            if len(instructions) <= idx:
-                instructions.append({x : NO_DATA for x in FORMATTED_HEADERS})
 
-            add_item(instructions, idx, item, header, series)
-            idx += 1
+        items = series.astype(str).str.split()
+        values = items[~items.str.join('').str.lower().isin(['notes:', 'nan'])].str.join(' ').astype(object).reset_index(drop=True)
+
+        while len(instructions) < len(values):
+            instructions.append({x : NO_DATA for x in FORMATTED_HEADERS})
+
+        add_column(instructions, values, header, series)
 
     if PARSE_FLAGS:   
         for instruction in instructions:
@@ -177,14 +202,61 @@ def get_instructions_from_table(table: DataFrame) -> List[Dict[str, str]]:
             
     return instructions
 
-with open(OUTPUT_FILENAME, 'w', newline='', encoding="utf-8") as output:
-    writer = csv.DictWriter(output, fieldnames=FORMATTED_HEADERS, delimiter='\t')
-    writer.writerow({ to_header(x) : x for x in HEADERS })
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('file', metavar='sdm.pdf', help='Intel® 64 and IA-32 Architectures Software Developer\'s Manual Combined Volumes 2A, 2B, 2C, and 2D: Instruction Set Reference, A-Z')
+    parser.add_argument('--pages', nargs=2, type=int, metavar=('BEGIN', 'END'), help=f'Inclusive page range to scrape. Defaults to the whole PDF, or {PAGE_BEGIN}-{PAGE_END} with --no-page-index')
+    parser.add_argument('--no-page-index', action='store_true', help='Run table extraction on every page in range, instead of only the pages the PDF\'s outline and text layer place an opcode table on')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND, help='Table extractor. \'tabula\' needs a Java runtime, \'native\' is pure Python (pdfplumber)')
+    parser.add_argument('--workers', type=int, default=1, help='Number of extraction processes. With the tabula backend, each worker runs its own JVM')
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE, help='Number of pages extracted per backend call')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Directory of the per-page table extraction cache')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE_MB, help='Maximum size of the extraction cache in MB')
+    parser.add_argument('--no-cache', action='store_true', help='Always extract tables from the PDF, without reading or writing the cache')
+    parser.add_argument('--invalidate-cache', action='store_true', help='Clear the extraction cache before scraping')
+    parser.add_argument('--print-table', action='store_true', help='Pretty-print the whole output table once scraping finishes')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_arguments()
+
+    cache = None
+    if not args.no_cache:
+        cache = TableCache(args.cache_dir, args.cache_size * 1024 * 1024, hash_file(args.file), get_extractor_settings(args.backend))
+        if args.invalidate_cache:
+            cache.clear()
+
+    if args.no_page_index:
+        begin, end = args.pages or (PAGE_BEGIN, PAGE_END)
+        pages = list(range(begin, end + 1))
+    else:
+        pages = cache.get_page_index() if cache is not None else None
+        if pages is None:
+            pages = get_opcode_table_pages(args.file)
+            if cache is not None:
+                cache.put_page_index(pages)
+        if args.pages:
+            pages = [x for x in pages if args.pages[0] <= x <= args.pages[1]]
+
+    with open(OUTPUT_FILENAME, 'w', newline='', encoding="utf-8") as output:
+        writer = csv.DictWriter(output, fieldnames=FORMATTED_HEADERS, delimiter='\t')
+        writer.writerow({ to_header(x) : x for x in HEADERS })
+
+        # Tables are normalized and written as they are extracted, and are never all held in memory at once
+        table_count = 0
+        row_count = 0
+        for table in extract_tables(args.file, pages, args.workers, args.shard_size, cache, args.backend):
+            if not table.empty and list(table)[0].strip().startswith(TABLE_HEADER_0_START):
+                instructions = get_instructions_from_table(table)
+                writer.writerows(instructions)
+                table_count += 1
+                row_count += len(instructions)
+
+    if cache is not None:
+        cache.evict()
 
-    for i in range(len(df)):
-        table = df[i]
-        if not table.empty and list(table)[0].strip().startswith(TABLE_HEADER_0_START):
-            writer.writerows(get_instructions_from_table(table))
+    print(f'Pages: {len(pages)}, Opcode-Tables: {table_count}, Instructions: {row_count}')
 
-with open(OUTPUT_FILENAME, 'r', encoding="utf-8") as inp:
-    print(tabulate(csv.reader(inp, delimiter='\t'), tablefmt="grid"))
+    if args.print_table:
+        with open(OUTPUT_FILENAME, 'r', encoding="utf-8") as inp:
+            print(tabulate(csv.reader(inp, delimiter='\t'), tablefmt="grid"))
@@ -0,0 +1,62 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import pdfplumber
+from pandas import DataFrame
+
+
+# The SDM's opcode tables are fully ruled, so cells are found from the drawn lines alone, like tabula's lattice mode
+TABLE_SETTINGS = { 'vertical_strategy' : 'lines', 'horizontal_strategy' : 'lines' }
+# tabula joins the lines of a multi-line cell with '\r', which get_instructions_from_table relies on to split merged Opcode/Instruction cells
+LINE_SEPARATOR = '\r'
+
+def to_cell(text: Optional[str]) -> str | float:
+    return text.replace('\n', LINE_SEPARATOR) if text else np.nan
+
+def to_columns(header: List[str | float]) -> List[str]:
+    # Unnamed and duplicate headers are renamed the way tabula-py does ('Unnamed: 0', 'Flags.1', ...)
+    columns = []
+    unnamed = 0
+    for col in header:
+        if col is np.nan:
+            col = f'Unnamed: {unnamed}'
+            unnamed += 1
+        columns.append(col)
+
+    counts: Dict[str, int] = defaultdict(int)
+    for idx, col in enumerate(columns):
+        count = counts[col]
+        while count > 0:
+            counts[col] = count + 1
+            col = f'{col}.{count}'
+            count = counts[col]
+        columns[idx] = col
+        counts[col] = count + 1
+
+    return columns
+
+def to_dataframe(rows: List[List[Optional[str]]]) -> DataFrame:
+    header, *data = [[to_cell(x) for x in row] for row in rows]
+    table = DataFrame(data=data, columns=to_columns(header))
+
+    for col in table.columns:
+        try:
+            table[col] = pd.to_numeric(table[col], errors='raise')
+        except (ValueError, TypeError):
+            pass
+    return table
+
+# Pure Python replacement for tabula.read_pdf(file, pages=pages, lattice=True), built on the PDF's text and vector layers.
+# Returns the tables of the given 1-indexed pages in page order, shaped like the DataFrames tabula returns
+def read_pdf(file: str, pages: int | List[int]) -> List[DataFrame]:
+    if isinstance(pages, int):
+        pages = [pages]
+
+    tables = []
+    with pdfplumber.open(file) as pdf:
+        for page in pages:
+            for rows in pdf.pages[page - 1].extract_tables(TABLE_SETTINGS):
+                if rows:
+                    tables.append(to_dataframe(rows))
+    return tables
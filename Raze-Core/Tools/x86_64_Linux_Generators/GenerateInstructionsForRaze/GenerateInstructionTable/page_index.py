@@ -0,0 +1,47 @@
+import re
+from typing import List
+from pypdf import PdfReader
+
+
+# Outline entries of instruction reference pages, e.g. 'ADD—Add', 'MOVSX/MOVSXD—Move With Sign-Extension', 'Jcc—Jump if Condition Is Met'
+INSTRUCTION_TITLE = re.compile(r'^[A-Z][A-Za-z0-9/ ,]*[—–]')
+# The header row of an opcode table ('Opcode', 'Opcode/Instruction', 'Opcode*', ...) starts a line in the text layer
+OPCODE_TABLE_HEADER = re.compile(r'^\s*Opcode', re.MULTILINE)
+# Pages an instruction's title may precede its opcode table by
+MAX_TABLE_OFFSET = 1
+
+def get_instruction_start_pages(reader: PdfReader) -> List[int]:
+    pages = set()
+
+    def walk(outline):
+        for item in outline:
+            if isinstance(item, list):
+                walk(item)
+            elif INSTRUCTION_TITLE.match(item.title):
+                pages.add(reader.get_destination_page_number(item))
+
+    walk(reader.outline)
+    return sorted(pages)
+
+def has_opcode_table(reader: PdfReader, page: int) -> bool:
+    return OPCODE_TABLE_HEADER.search(reader.pages[page].extract_text()) is not None
+
+# Returns the 1-indexed pages holding an opcode table, in ascending order.
+# Opcode tables open each instruction's reference section, so only the pages following an instruction's outline entry are scanned,
+# up to the end of its (possibly multi-page) table. PDFs without an outline fall back to scanning the text layer of every page
+def get_opcode_table_pages(file: str) -> List[int]:
+    reader = PdfReader(file)
+    page_count = len(reader.pages)
+
+    start_pages = get_instruction_start_pages(reader)
+    if not start_pages:
+        return [x + 1 for x in range(page_count) if has_opcode_table(reader, x)]
+
+    result = set()
+    for start in start_pages:
+        page = next((x for x in range(start, min(start + MAX_TABLE_OFFSET + 1, page_count)) if has_opcode_table(reader, x)), None)
+        while page is not None and page < page_count and page not in result and has_opcode_table(reader, page):
+            result.add(page)
+            page += 1
+
+    return [x + 1 for x in sorted(result)]
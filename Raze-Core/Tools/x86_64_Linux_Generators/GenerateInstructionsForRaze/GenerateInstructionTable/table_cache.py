@@ -0,0 +1,82 @@
+import os
+import json
+import pickle
+import hashlib
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+from pandas import DataFrame
+
+
+CACHE_FILE_EXTENSION = '.pkl'
+PAGE_INDEX_KEY = 'page-index'
+
+def hash_file(file: str) -> str:
+    digest = hashlib.sha256()
+    with open(file, 'rb') as fd:
+        while chunk := fd.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# On-disk cache of the raw tables extracted from each PDF page, keyed by the PDF's content hash, the page number and the extractor settings.
+# Entries are evicted least-recently-used first once the cache grows past max_size bytes
+class TableCache:
+    def __init__(self, directory: str, max_size: int, pdf_hash: str, settings: Dict[str, str]) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.pdf_hash = pdf_hash
+        self.settings = json.dumps(settings, sort_keys=True)
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: int | str) -> str:
+        digest = hashlib.sha256(f'{self.pdf_hash}:{key}:{self.settings}'.encode()).hexdigest()
+        return os.path.join(self.directory, digest + CACHE_FILE_EXTENSION)
+
+    def load(self, key: int | str) -> Optional[Any]:
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as fd:
+                value = pickle.load(fd)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        # Mark the entry as recently used
+        os.utime(path)
+        return value
+
+    def store(self, key: int | str, value: Any) -> None:
+        # Write to a temporary file first so concurrent workers never observe a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as output:
+            pickle.dump(value, output, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path(key))
+
+    def get(self, page: int) -> Optional[List[DataFrame]]:
+        return self.load(page)
+
+    def put(self, page: int, tables: List[DataFrame]) -> None:
+        self.store(page, tables)
+
+    def get_page_index(self) -> Optional[List[int]]:
+        return self.load(PAGE_INDEX_KEY)
+
+    def put_page_index(self, pages: List[int]) -> None:
+        self.store(PAGE_INDEX_KEY, pages)
+
+    def evict(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(CACHE_FILE_EXTENSION):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(x[1] for x in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            os.remove(path)
+            size -= entry_size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
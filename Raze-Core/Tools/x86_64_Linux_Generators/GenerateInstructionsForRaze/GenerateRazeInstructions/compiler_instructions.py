@@ -0,0 +1,53 @@
+import os
+import re
+from parse_exception import ParseException
+import table_types
+
+
+# The mnemonics the compiler can assemble: the members of AssemblyExpr.Instruction (emitted by CodeGen, and parsed from inline assembly)
+# and the keys of the inline assembly tables (CodeGen.InlineAssemblyOps). Members after the '// Custom Instructions' comment (e.g. CAST)
+# are lowered by CodeGen and never reach the assembler
+DEFAULT_SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'Src')
+INSTRUCTION_ENUM_FILE = os.path.join('CodeGen', 'Instruction.cs')
+INLINE_ASSEMBLY_TABLES_FILE = os.path.join('CodeGen', 'InlineAssemblyInstructions.cs')
+CUSTOM_INSTRUCTIONS_COMMENT = '// Custom Instructions'
+
+def read_source(source_dir: str, file: str) -> str:
+    with open(os.path.join(source_dir, file), encoding='utf-8-sig') as fd:
+        return fd.read()
+
+def get_instruction_enum(source: str) -> tuple[list[str], list[str]]:
+    match = re.search(r'enum\s+Instruction\s*\{(.*?)\}', source, re.DOTALL)
+    if match is None:
+        raise ParseException('AssemblyExpr.Instruction not found')
+
+    instructions, custom = [], []
+    members = instructions
+    for line in match.group(1).splitlines():
+        line = line.strip()
+        if line.startswith(CUSTOM_INSTRUCTIONS_COMMENT):
+            members = custom
+        line = line.split('//')[0].strip().rstrip(',').strip()
+        if line:
+            members.append(line)
+    return instructions, custom
+
+def get_inline_assembly_instructions(source: str) -> list[str]:
+    return re.findall(r'\{\s*([A-Z][A-Z0-9]*)\s*,', source)
+
+def get_compiler_instructions(source_dir: str = DEFAULT_SOURCE_DIR) -> list[str]:
+    instructions, custom = get_instruction_enum(read_source(source_dir, INSTRUCTION_ENUM_FILE))
+
+    for instruction in get_inline_assembly_instructions(read_source(source_dir, INLINE_ASSEMBLY_TABLES_FILE)):
+        if instruction not in instructions and instruction not in custom:
+            instructions.append(instruction)
+    return instructions
+
+# The given mnemonics without an encoding in the schema
+def get_missing_instructions(instructions: table_types.instruction_table, mnemonics: list[str]) -> list[str]:
+    return [x for x in mnemonics if not instructions.get(x)]
+
+# Keeps only the given mnemonics of the schema, in its order. Returns the subset and the mnemonics the schema is missing
+def subset_instructions(instructions: table_types.instruction_table, mnemonics: list[str]) -> tuple[table_types.instruction_table, list[str]]:
+    keep = set(mnemonics)
+    return { k : v for k, v in instructions.items() if k in keep }, get_missing_instructions(instructions, mnemonics)
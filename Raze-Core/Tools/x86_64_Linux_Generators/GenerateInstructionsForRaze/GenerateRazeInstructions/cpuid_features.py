@@ -0,0 +1,32 @@
+import itertools
+
+# CPUID feature flags an encoding requires, parsed from the 'CPUID Feature Flag' column (e.g. 'POPCNT', 'SSE4_1', 'AVX512VL AVX512F',
+# 'AVX512VL AND GFNI', 'AVX512VL AND AVX512BW OR AVX10.1'). OR separates alternatives, each requiring all of its features: the whole
+# conjunction before an OR is one alternative. The requirements are returned in conjunctive form, each one an 'A|B' choice of features, e.g.
+# 'AVX512VL AND AVX512BW OR AVX10.1' requires ('AVX512VL|AVX10.1', 'AVX512BW|AVX10.1'). An empty tuple means the encoding runs on any x86-64 CPU
+def get_cpuid_features(featureFlag: str) -> tuple[str, ...]:
+    alternatives: list[list[str]] = [[]]
+
+    for token in featureFlag.replace(',', ' ').split():
+        if token == 'AND':
+            continue
+        if token == 'OR':
+            alternatives.append([])
+        elif token not in alternatives[-1]:
+            alternatives[-1].append(token)
+
+    alternatives = [x for x in alternatives if x]
+
+    # (A and B) or C = (A or C) and (B or C): a requirement per choice of one feature of each alternative
+    features: list[str] = []
+    for choice in itertools.product(*alternatives):
+        requirement = '|'.join(dict.fromkeys(choice))
+        if requirement not in features:
+            features.append(requirement)
+
+    return tuple(features) if alternatives else ()
+
+# Whether a CPU with the features of 'features' has those of 'required' (both as returned by get_cpuid_features): each requirement of
+# 'required' is implied by a requirement of 'features' that allows no other features
+def implies(features: tuple[str, ...], required: tuple[str, ...]) -> bool:
+    return all(any(set(x.split('|')) <= set(y.split('|')) for x in features) for y in required)
@@ -0,0 +1,29 @@
+import itertools
+from operand_types import OperandType, matches, to_signature_operand, signature_operand_types, signature_operand_sizes, signature_operand_size_limit
+import table_types
+
+
+# Maps each operand signature an instruction can be assembled with to the indices of the encodings it matches, in the (priority) order of
+# the encodings. Signatures without a matching encoding are left out
+def get_encoding_index(encodings: list[table_types.Encoding]) -> dict[bytes, list[int]]:
+    index: dict[bytes, list[int]] = {}
+    schema_operands = [[y.get_schema_operand() for y in x.operands] for x in encodings]
+
+    for operand_count in sorted(set(len(x) for x in schema_operands)):
+        candidates = [i for i, x in enumerate(schema_operands) if len(x) == operand_count]
+
+        # Only the operands matching some encoding in their position can be part of a matching signature
+        positions: list[list[tuple[OperandType, int]]] = [
+            [
+                operand for operand in itertools.product(signature_operand_types, signature_operand_sizes)
+                if operand[1] < signature_operand_size_limit and any(matches(operand, schema_operands[i][position]) for i in candidates)
+            ]
+            for position in range(operand_count)
+        ]
+
+        for signature in itertools.product(*positions):
+            matching = [i for i in candidates if all(matches(operand, schema_operands[i][idx]) for idx, operand in enumerate(signature))]
+            if matching:
+                index[bytes(to_signature_operand(x) for x in signature)] = matching
+
+    return index
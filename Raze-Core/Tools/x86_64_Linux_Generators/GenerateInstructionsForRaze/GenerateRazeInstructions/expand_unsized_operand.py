@@ -1,5 +1,6 @@
-from get_operand import Operand
+from get_operand import Operand, UNSIZED, resize_operand
 import write_instruction as wI
+from get_vex import Vex
 import table_types
 
 
@@ -11,23 +12,29 @@ def expand_unsized_operand(
         instructions: table_types.instruction_table, 
         instruction_name: str, 
         operands: list[Operand], 
-        opcode: str, 
-        encodingType: set[str], 
-        opcodeExt: int
+        opcode: bytes, 
+        encodingType: int, 
+        opcodeExt: int,
+        vex: Vex | None,
+        features: tuple[str, ...]
     ):
 
-    unsizedOperands = [operand for operand in operands if operand.size == -2]
+    # operands is the parsed row's own list. Each unsized operand is replaced by its sized (interned) operands in turn,
+    # and the remaining unsized operands are expanded by the recursive write_instruction
+    unsizedOperands = [idx for idx, operand in enumerate(operands) if operand.size == UNSIZED]
 
-    for operand in unsizedOperands:
+    for idx in unsizedOperands:
         for size in ([8] if instruction_name in unsized_includes_8bit else []) + [ 16, 32, 64 ]:
-            operand.size = size
+            operands[idx] = resize_operand(operands[idx], size)
             wI.write_instruction(
                 instructions, 
                 instruction_name,
                 operands,
                 opcode,
                 encodingType,
-                opcodeExt
+                opcodeExt,
+                vex,
+                features
             )
 
     return unsizedOperands
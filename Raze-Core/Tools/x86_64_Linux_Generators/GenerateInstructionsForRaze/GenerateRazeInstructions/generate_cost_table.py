@@ -0,0 +1,37 @@
+import sys
+import json
+import argparse
+import table_types
+from instruction_costs import read_dataset, get_cost_table
+
+
+# Joins an offline instruction timing dataset to a JSON encoding schema, and writes the latency, reciprocal throughput and µop count of
+# every encoding per microarchitecture (for cost-based instruction selection and peephole rules in the compiler)
+parser = argparse.ArgumentParser()
+parser.add_argument('dataset', metavar='instructions.xml', help="The timing dataset: uops.info's instructions.xml, or a CSV export of it (see instruction_costs.read_csv_dataset)")
+parser.add_argument('schema', metavar='EncodingSchema.json')
+parser.add_argument('--arch', metavar='NAME', action='append', help='Only keep this microarchitecture (e.g. SKL, ZEN4). May be given more than once')
+parser.add_argument('--output', metavar='FILE', help='Write the cost table to FILE instead of stdout')
+args = parser.parse_args()
+
+with open(args.schema) as fd:
+    instructions = table_types.from_json(json.load(fd))
+
+dataset = read_dataset(args.dataset, set(args.arch) if args.arch else None)
+if args.arch and (missing := [x for x in args.arch if x not in dataset]):
+    print(f"Microarchitectures not in the dataset: {', '.join(missing)}", file=sys.stderr)
+    exit(1)
+
+table, covered = get_cost_table(instructions, dataset)
+
+if args.output:
+    with open(args.output, 'w') as fd:
+        json.dump(table, fd, indent=2)
+        fd.write('\n')
+else:
+    json.dump(table, sys.stdout, indent=2)
+    print()
+
+encodings = sum(len(x) for x in instructions.values())
+for architecture, count in covered.items():
+    print(f"{architecture}: {count}/{encodings} encodings with costs ({(count / encodings) * 100 if encodings else 0:.2f}%)", file=sys.stderr)
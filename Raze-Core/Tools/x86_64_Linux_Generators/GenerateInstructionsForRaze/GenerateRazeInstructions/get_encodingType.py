@@ -1,9 +1,10 @@
 from get_operand import Operand
+from operand_types import to_encoding_type
 
 
-def get_encodingType(operands: list[Operand], operand_encoding: str, encodingType: set[str]) -> str:
+def get_encodingType(operands: list[Operand], operand_encoding: str, encodingType: set[str]) -> int:
 
     if len(operands) == 2 and operand_encoding == 'I':
         encodingType.add('NoModRegRM')
 
-    return ' | '.join(encodingType)
+    return to_encoding_type(encodingType)
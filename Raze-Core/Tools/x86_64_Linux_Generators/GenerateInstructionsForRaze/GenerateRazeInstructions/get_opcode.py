@@ -11,19 +11,23 @@ def get_opcode_extension(opcode: str) -> int:
 
     return opCodeExt
 
-def get_opcode(opcode: str, encodingType: set[str]) -> str:
-    result = ''
+def get_opcode(opcode: str, encodingType: set[str]) -> bytes:
+    result = bytearray()
     
     for opcode_byte in opcode.split():
         if opcode_byte in ['cb', 'cw', 'cd', 'cp', 'co', 'ct', 'ib', 'iw', 'id', 'io', '/r']:
             continue
         elif re.match(HEX_DIGIT + '{2}', opcode_byte):
+            # The repeat prefix byte is kept as an encoding type (see to_raze_args). These rows are schema-only: Encoding.SpecialMatch
+            # rejects them and the assembler never emits F3/F2, so REP MOVS etc. cannot be assembled yet
+            if not result and ((opcode_byte == 'F3' and 'RepPrefix' in encodingType) or (opcode_byte == 'F2' and 'RepnePrefix' in encodingType)):
+                continue
             if len(opcode_byte) == 2:
-                result += ' ' + opcode_byte.upper()
+                result.append(int(opcode_byte, 16))
             elif opcode_byte.endswith(('+rb', '+rw', '+rd', '+ro')):
                 encodingType.add('AddRegisterToOpCode')
                 encodingType.add('NoModRegRM')
-                result += ' ' + opcode_byte[:-3].upper()
+                result.append(int(opcode_byte[:-3], 16))
             else:
                 raise ParseException("Unrecognized opcode-byte: " + opcode_byte)                
         elif re.match('/' + HEX_DIGIT + '$', opcode_byte):
@@ -37,7 +41,10 @@ def get_opcode(opcode: str, encodingType: set[str]) -> str:
                 encodingType.add('RexPrefix')
         elif opcode_byte in [ 'NP', 'NFx' ]:
             pass
+        elif opcode_byte.startswith('VEX.'):
+            # Parsed by get_vex
+            continue
         else:
             raise ParseException("Unrecognized opcode-byte: " + opcode_byte)
         
-    return result[1:]
+    return bytes(result)
@@ -1,21 +1,55 @@
+import re
 from parse_exception import ParseException
+from operand_types import OperandType, to_operand_type, split_operand
 
 
+# Size (in bits) of a register or memory operand given without one (e.g. 'reg', 'm'). Expanded to every size by expand_unsized_operand
+UNSIZED = -2
+
+# Operands are immutable and interned (see intern_operand), so every encoding with e.g. an RM32 operand shares one object
 class Operand:
+    __slots__ = ('name', 'size', 'displaySize', 'schema')
+
     def __init__(self, name: str, size: int, displaySize: bool = True) -> None:
         self.name = name
         self.size = size
         self.displaySize = displaySize
+        self.schema: tuple[OperandType, int] | None = None
     
     def __str__(self) -> str:
         return self.name + (str(self.size) if self.displaySize else '')
 
+    # The operand's type and size (in bytes), as the assembler reads it from the schema
+    def get_schema_operand(self) -> tuple[OperandType, int]:
+        if self.schema is None:
+            self.schema = to_operand_type(str(self))
+        return self.schema
+
+operands: dict[tuple[str, int, bool], Operand] = {}
+
+def intern_operand(name: str, size: int, displaySize: bool = True) -> Operand:
+    key = (name, size, displaySize)
+    if key not in operands:
+        operands[key] = Operand(name, size, displaySize)
+    return operands[key]
+
+def resize_operand(operand: Operand, size: int) -> Operand:
+    return intern_operand(operand.name, size, operand.displaySize)
+
+# Inverse of str(Operand), for operands read back from a JSON schema
+def parse_schema_operand(operand: str) -> Operand:
+    name, size = split_operand(operand)
+    if size and name != '1':
+        return intern_operand(name, int(size))
+    return intern_operand(name, to_operand_type(operand)[1] * 8 if name != '1' else 1, False)
+
 argTable = {
     "r" : "R",
     "m" : "M",
     "imm" : "IMM",
     "r/m" : "RM",
     'xmm/m' : 'XMMRM',
+    'ymm/m' : 'YMMRM',
     'moffs' : 'MOFFS',
     'mm/m' : 'MMXRM',
     'regna' : 'RNA',
@@ -23,6 +57,7 @@ argTable = {
 
 regSize = { 
     'xmm' : ('XMM', 16),
+    'ymm' : ('YMM', 32),
     'mm' : ('MMX', 8),
     'AL' : ('AL', 1),
     'AX' : ('AX', 2),
@@ -48,7 +83,7 @@ regSize = {
 
 def reg_to_operand(reg: str) -> Operand:
     name, size = regSize[reg]
-    return Operand(name, size * 8, False)
+    return intern_operand(name, size * 8, False)
 
 
 def get_operand(arg: str, encodingType: set[str]) -> Operand:
@@ -56,6 +91,8 @@ def get_operand(arg: str, encodingType: set[str]) -> Operand:
         arg = arg[:-3]
     elif arg.endswith('fp'):
         arg = arg[:-2]
+    # The VEX-encoded rows spell r/m32 as r32/m32
+    arg = re.sub(r'^r(\d+)/m\1$', r'r/m\1', arg)
 
     argType = arg.rstrip('1234567890')
     argSize = int(arg[len(argType):]) if len(argType) != len(arg) else -1 
@@ -65,14 +102,14 @@ def get_operand(arg: str, encodingType: set[str]) -> Operand:
         argType = 'imm'
 
     if argType == '' and argSize == 1:
-        return Operand('1', '1', False)
+        return intern_operand('1', 1, False)
     
     if argSize == -1:
         if argType == 'reg':
-            return Operand(argTable['r'], -2)
+            return intern_operand(argTable['r'], UNSIZED)
         if argType == 'm':
-            return Operand(argTable['m'], -2)
+            return intern_operand(argTable['m'], UNSIZED)
         else:
             return reg_to_operand(argType)
     
-    return Operand(argTable[argType], argSize)
+    return intern_operand(argTable[argType], argSize)
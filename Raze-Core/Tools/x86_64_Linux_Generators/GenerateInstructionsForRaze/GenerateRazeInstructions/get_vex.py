@@ -0,0 +1,71 @@
+from typing import NamedTuple
+from get_operand import Operand
+from parse_exception import ParseException
+
+
+# Fields of the VEX prefix of an AVX/AVX2/FMA/BMI encoding (Intel SDM Vol. 2, 2.3), parsed from the opcode's 'VEX.L.pp.mmmmm.W' token.
+# The mandatory prefix and the 0F/0F38/0F3A escape bytes are folded into pp and mmmmm, so they are not part of the encoding's opcode
+class Vex(NamedTuple):
+    L: int
+    pp: int
+    mmmmm: int
+    W: int
+    # Index of the operand encoded in VEX.vvvv, or -1 if vvvv is unused (1111b)
+    vvvv: int
+
+vex_lengths = { '128' : 0, 'L0' : 0, 'LZ' : 0, 'LIG' : 0, '256' : 1, 'L1' : 1 }
+vex_mandatory_prefixes = { '66' : 1, 'F3' : 2, 'F2' : 3 }
+vex_opcode_maps = { '0F' : 1, '0F38' : 2, '0F3A' : 3 }
+vex_widths = { 'W0' : 0, 'WIG' : 0, 'W1' : 1 }
+# Older SDM revisions name the operand encoded in vvvv: the destination (NDD) or the first source (NDS, DDS)
+vex_vvvv_operands = { 'NDD' : 0, 'NDS' : 1, 'DDS' : 1 }
+
+def get_vex_token(opcode: str) -> str | None:
+    return next((x for x in opcode.split() if x.startswith('VEX.')), None)
+
+def get_vvvv_operand(vvvvOperand: int | None, operands: list[Operand], operandEncoding: str, opcode: str) -> int:
+    # Descriptive operand encodings (e.g. RVM, RMV, VMI) give the position of vvvv directly
+    if operandEncoding.isalpha() and len(operandEncoding) > 1 and 'V' in operandEncoding:
+        return operandEncoding.index('V')
+    if vvvvOperand is not None:
+        return vvvvOperand
+
+    nonImmediates = len([x for x in operands if x.name not in ('IMM', '1')])
+    # With an opcode extension in ModRM.reg, the destination is encoded in vvvv (e.g. VPSLLD xmm1, xmm2, imm8)
+    if any(x.startswith('/') and x[1:].isdigit() for x in opcode.split()) and nonImmediates >= 2:
+        return 0
+    return 1 if nonImmediates >= 3 else -1
+
+def get_vex(opcode: str, operands: list[Operand], operandEncoding: str) -> Vex | None:
+    token = get_vex_token(opcode)
+    if token is None:
+        return None
+
+    L = pp = W = 0
+    mmmmm = None
+    vvvvOperand = None
+
+    for field in token.split('.')[1:]:
+        if field in vex_lengths:
+            L = vex_lengths[field]
+        elif field in vex_mandatory_prefixes:
+            pp = vex_mandatory_prefixes[field]
+        elif field in vex_opcode_maps:
+            mmmmm = vex_opcode_maps[field]
+        elif field in vex_widths:
+            W = vex_widths[field]
+        elif field in vex_vvvv_operands:
+            vvvvOperand = vex_vvvv_operands[field]
+        else:
+            raise ParseException(f'Unrecognized VEX field: {field}')
+
+    if mmmmm is None:
+        raise ParseException(f'VEX prefix without an opcode map: {token}')
+
+    return Vex(L, pp, mmmmm, W, get_vvvv_operand(vvvvOperand, operands, operandEncoding, opcode))
+
+# The VEX token the encoding was parsed from (e.g. VEX.256.66.0F38.W0), plus the operand encoded in vvvv
+def get_vex_string(vex: Vex) -> str:
+    prefix = next((k for k, v in vex_mandatory_prefixes.items() if v == vex.pp), None)
+    fields = ['VEX', ['128', '256'][vex.L]] + ([prefix] if prefix else []) + [next(k for k, v in vex_opcode_maps.items() if v == vex.mmmmm), f'W{vex.W}']
+    return '.'.join(fields) + (f' vvvv={vex.vvvv}' if vex.vvvv != -1 else '')
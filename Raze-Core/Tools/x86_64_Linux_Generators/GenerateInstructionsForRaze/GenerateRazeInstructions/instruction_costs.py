@@ -0,0 +1,211 @@
+import csv
+import xml.etree.ElementTree as ET
+from operand_types import OperandType, matches
+from parse_exception import ParseException
+import table_types
+
+
+# Latency, reciprocal throughput and µop count of an instruction variant on one microarchitecture, read from an offline timing dataset
+# (the instructions.xml of uops.info, or a CSV export of it), and joined to the schema's encodings by mnemonic and operand signature.
+# A dataset operand is a (OperandType, size in bytes) like a schema operand, except address-generation operands (LEA), whose size is None
+
+class InstructionCost:
+    __slots__ = ('mnemonic', 'operands', 'latency', 'throughput', 'uops')
+
+    def __init__(self, mnemonic: str, operands: tuple[tuple[OperandType, int | None], ...], latency: int | None, throughput: float | None, uops: int | None) -> None:
+        self.mnemonic = mnemonic
+        self.operands = operands
+        self.latency = latency
+        self.throughput = throughput
+        self.uops = uops
+
+    def get_operands(self) -> str:
+        return ', '.join(to_string(x) for x in self.operands)
+
+    def to_json(self) -> dict[str, str | int | float]:
+        result: dict[str, str | int | float] = { 'Operands' : self.get_operands() }
+        if self.latency is not None:
+            result['Latency'] = self.latency
+        if self.throughput is not None:
+            result['Throughput'] = self.throughput
+        if self.uops is not None:
+            result['Uops'] = self.uops
+        return result
+
+# Per microarchitecture (e.g. SKL, ZEN4), per mnemonic, the measured variants
+cost_dataset = dict[str, dict[str, list[InstructionCost]]]
+
+# Registers named by the dataset for operands that only accept one register. Mirrors the fixed-register operands of operand_types
+fixed_registers = {
+    'AL' : (OperandType.A, 1), 'AX' : (OperandType.A, 2), 'EAX' : (OperandType.A, 4), 'RAX' : (OperandType.A, 8),
+    'CL' : (OperandType.C, 1), 'CX' : (OperandType.C, 2), 'ECX' : (OperandType.C, 4), 'RCX' : (OperandType.C, 8),
+    'DL' : (OperandType.D, 1), 'DX' : (OperandType.D, 2), 'EDX' : (OperandType.D, 4), 'RDX' : (OperandType.D, 8),
+}
+vector_registers = { 'XMM' : (OperandType.XMM, 16), 'YMM' : (OperandType.YMM, 32), 'MM' : (OperandType.MMX, 8) }
+operand_names = { OperandType.R : 'R', OperandType.M : 'M', OperandType.IMM : 'IMM', OperandType.One : '1', OperandType.XMM : 'XMM', OperandType.YMM : 'YMM', OperandType.MMX : 'MM' }
+
+def to_string(operand: tuple[OperandType, int | None]) -> str:
+    operandType, size = operand
+    if size is None:
+        return 'AGEN'
+    if fixed := next((k for k, v in fixed_registers.items() if v == operand), None):
+        return fixed
+    if operandType in (OperandType.One, OperandType.XMM, OperandType.YMM, OperandType.MMX):
+        return operand_names[operandType]
+    return operand_names[operandType] + str(size * 8)
+
+# An operand of the CSV notation: R8-R64, M8-M256, IMM8-IMM64, 1, AGEN, XMM, YMM, MM, or a fixed register (AL, CL, EAX, ...)
+def parse_operand(operand: str) -> tuple[OperandType, int | None]:
+    if operand == 'AGEN':
+        return OperandType.M, None
+    if operand == '1':
+        return OperandType.One, 1
+    if operand in fixed_registers:
+        return fixed_registers[operand]
+    if operand in vector_registers:
+        return vector_registers[operand]
+
+    name = operand.rstrip('0123456789')
+    if name in ('R', 'M', 'IMM') and name != operand:
+        return { 'R' : OperandType.R, 'M' : OperandType.M, 'IMM' : OperandType.IMM }[name], int(operand[len(name):]) // 8
+    raise ParseException(f'Unrecognized operand: {operand}')
+
+# An <operand> of uops.info's instructions.xml. Returns None for operands that are not part of the instruction's syntax (e.g. flags)
+def parse_xml_operand(operand: ET.Element) -> tuple[OperandType, int | None] | None:
+    if operand.get('suppressed') == '1':
+        return None
+
+    match operand.get('type'):
+        case 'reg':
+            registers = (operand.text or '').split(',')
+            if len(registers) == 1 and registers[0] in fixed_registers:
+                return fixed_registers[registers[0]]
+            if prefix := next((x for x in vector_registers if registers[0].startswith(x)), None):
+                return vector_registers[prefix]
+            return OperandType.R, int(operand.get('width', 0)) // 8
+        case 'mem':
+            return OperandType.M, int(operand.get('width', 0)) // 8
+        case 'agen':
+            return OperandType.M, None
+        case 'imm':
+            if operand.text == '1':
+                return OperandType.One, 1
+            return OperandType.IMM, int(operand.get('width', 0)) // 8
+    return None
+
+# The mnemonic of an 'asm' attribute (e.g. 'ADD (R64, R64)', '{load} MOV (R64, R64)', 'LEA_B_D8 (R64)' for an addressing mode variant),
+# or None for prefixed forms (e.g. 'LOCK ADD', 'REP MOVSB')
+def get_mnemonic(asm: str) -> str | None:
+    tokens = [x for x in asm.split(' (')[0].split() if not x.startswith('{')]
+    return tokens[0].split('_')[0] if len(tokens) == 1 else None
+
+def get_latency(measurement: ET.Element) -> int | None:
+    cycles = [
+        int(v) for latency in measurement.iter('latency') for k, v in latency.attrib.items()
+        if k.startswith(('cycles', 'max_cycles')) and not k.endswith('is_upper_bound')
+    ]
+    return max(cycles) if cycles else None
+
+def get_throughput(measurement: ET.Element) -> float | None:
+    throughput = measurement.get('TP_unrolled') or measurement.get('TP_loop') or measurement.get('TP')
+    return float(throughput) if throughput is not None else None
+
+def add_cost(dataset: cost_dataset, architecture: str, cost: InstructionCost) -> None:
+    dataset.setdefault(architecture, {}).setdefault(cost.mnemonic, []).append(cost)
+
+def read_xml_dataset(file: str, architectures: set[str] | None) -> cost_dataset:
+    dataset: cost_dataset = {}
+
+    # The dataset is large, so instructions are parsed and discarded one at a time
+    for _, element in ET.iterparse(file):
+        if element.tag != 'instruction':
+            continue
+
+        mnemonic = get_mnemonic(element.get('asm', ''))
+        if mnemonic is not None:
+            operands = tuple(x for x in (parse_xml_operand(y) for y in element.iter('operand')) if x is not None)
+
+            for architecture in element.iter('architecture'):
+                name = architecture.get('name', '')
+                measurement = architecture.find('measurement')
+                if measurement is None or (architectures is not None and name not in architectures):
+                    continue
+
+                uops = measurement.get('uops')
+                add_cost(dataset, name, InstructionCost(mnemonic, operands, get_latency(measurement), get_throughput(measurement), int(uops) if uops else None))
+        element.clear()
+
+    return dataset
+
+# Columns: Architecture, Instruction (e.g. 'ADD R64, M64'), Latency, Throughput, Uops. Empty cells are unknown values
+def read_csv_dataset(file: str, architectures: set[str] | None) -> cost_dataset:
+    dataset: cost_dataset = {}
+
+    with open(file, newline='') as fd:
+        for row in csv.DictReader(fd):
+            if architectures is not None and row['Architecture'] not in architectures:
+                continue
+
+            mnemonic, *operands = row['Instruction'].split(' ', maxsplit=1)
+            add_cost(dataset, row['Architecture'], InstructionCost(
+                mnemonic,
+                tuple(parse_operand(x) for x in operands[0].split(', ')) if operands else (),
+                int(row['Latency']) if row['Latency'] else None,
+                float(row['Throughput']) if row['Throughput'] else None,
+                int(row['Uops']) if row['Uops'] else None
+            ))
+
+    return dataset
+
+def read_dataset(file: str, architectures: set[str] | None = None) -> cost_dataset:
+    return read_xml_dataset(file, architectures) if file.endswith('.xml') else read_csv_dataset(file, architectures)
+
+# Whether the schema operand is assembled from the dataset operand. Immediates must be of the same size and kind, since the dataset measures
+# each separately
+def matches_operand(operand: tuple[OperandType, int | None], schema_operand: tuple[OperandType, int]) -> bool:
+    operandType, size = operand
+    if size is None:
+        return bool(schema_operand[0] & OperandType.M)
+    if operandType == OperandType.IMM and size != schema_operand[1]:
+        return False
+    if (operandType == OperandType.One) != (schema_operand[0] == OperandType.One):
+        return False
+    return matches((operandType, size), schema_operand)
+
+# The measured variants each encoding is assembled for (e.g. both the register and the memory form of an RM operand). A variant measured
+# more than once (e.g. for each of its opcodes) is only kept once
+def get_encoding_costs(encoding: table_types.Encoding, costs: list[InstructionCost]) -> list[InstructionCost]:
+    schema_operands = [x.get_schema_operand() for x in encoding.operands]
+    result: dict[str, InstructionCost] = {}
+
+    for cost in costs:
+        if len(cost.operands) == len(schema_operands) and all(matches_operand(x, y) for x, y in zip(cost.operands, schema_operands)):
+            result.setdefault(cost.get_operands(), cost)
+
+    return list(result.values())
+
+# Per microarchitecture, per mnemonic, the costs of each encoding of the schema, as { 'Instruction', 'Operands', 'Latency', 'Throughput', 'Uops' }.
+# Also returns, per microarchitecture, the number of encodings with at least one measured variant
+def get_cost_table(
+        instructions: table_types.instruction_table,
+        dataset: cost_dataset
+    ) -> tuple[dict[str, dict[str, list[dict[str, str | int | float]]]], dict[str, int]]:
+
+    table: dict[str, dict[str, list[dict[str, str | int | float]]]] = {}
+    covered: dict[str, int] = {}
+
+    for architecture in sorted(dataset):
+        table[architecture] = {}
+        covered[architecture] = 0
+
+        for mnemonic in sorted(instructions):
+            entries = []
+            for encoding in instructions[mnemonic]:
+                costs = get_encoding_costs(encoding, dataset[architecture].get(mnemonic, []))
+                covered[architecture] += bool(costs)
+                entries += [{ 'Instruction' : encoding.get_instruction(), **x.to_json() } for x in costs]
+
+            if entries:
+                table[architecture][mnemonic] = entries
+
+    return table, covered
@@ -0,0 +1,157 @@
+from enum import IntFlag
+from parse_exception import ParseException
+
+
+# Mirrors Assembler.Encoder.Operand.OperandType (Raze-Core/Src/Assembly/Assembler/Operand.cs)
+class OperandType(IntFlag):
+    A = 2
+    C = 4
+    D = 8
+    RNA = 1 | C | D
+    R = RNA | A
+    M = 16
+    MOFFS = 32
+    One = 128
+    IMM = 64 | One
+    XMM = 256
+    MMX = 512
+    CR = 1024
+    DR = 2048
+    TR = 4096
+    CS = 16384
+    FS = 32768
+    GS = 65536
+    SEG = 8192 | CS | FS | GS
+    YMM = 131072
+
+# Mirrors Assembler.Encoder.Encoding.EncodingTypes (Raze-Core/Src/Assembly/Assembler/EncodingTypes.cs)
+encoding_types = {
+    'RexPrefix' : 1,
+    'RexWPrefix' : 2,
+    'SizePrefix' : 4,
+    'NoModRegRM' : 8,
+    'SignExtends' : 16,
+    'ZeroExtends' : 32,
+    'AddRegisterToOpCode' : 64,
+    'RelativeJump' : 128,
+    'NoUpper8BitEncoding' : 256,
+    'RepPrefix' : 512,
+    'RepnePrefix' : 1024,
+}
+
+# Operand names of the schema, with the size (in bytes) of fixed-size operands. Mirrors Encoding.GetOperandsFromInstruction
+operand_types = {
+    'R' : (OperandType.R, None),
+    'RM' : (OperandType.R | OperandType.M, None),
+    'AL' : (OperandType.A, 1),
+    'AX' : (OperandType.A, 2),
+    'EAX' : (OperandType.A, 4),
+    'RAX' : (OperandType.A, 8),
+    'CL' : (OperandType.C, 1),
+    'CX' : (OperandType.C, 2),
+    'ECX' : (OperandType.C, 4),
+    'RCX' : (OperandType.C, 8),
+    'DL' : (OperandType.D, 1),
+    'DX' : (OperandType.D, 2),
+    'EDX' : (OperandType.D, 4),
+    'RDX' : (OperandType.D, 8),
+    'RNA' : (OperandType.RNA, None),
+    'M' : (OperandType.M, None),
+    'MOFFS' : (OperandType.MOFFS, None),
+    'IMM' : (OperandType.IMM, None),
+    '1' : (OperandType.One, 1),
+    'XMM' : (OperandType.XMM, 16),
+    'XMMRM' : (OperandType.XMM | OperandType.M, None),
+    'MMX' : (OperandType.MMX, 16),
+    'MMXRM' : (OperandType.MMX | OperandType.M, None),
+    'CR' : (OperandType.CR, 8),
+    'DR' : (OperandType.DR, 8),
+    'TR' : (OperandType.TR, 4),
+    'SEG' : (OperandType.SEG, 2),
+    'CS' : (OperandType.CS, 2),
+    'FS' : (OperandType.FS, 2),
+    'GS' : (OperandType.GS, 2),
+    'YMM' : (OperandType.YMM, 32),
+    'YMMRM' : (OperandType.YMM | OperandType.M, None),
+}
+
+operand_sizes = { '256' : 32, '128' : 16, '64' : 8, '32' : 4, '16' : 2, '8' : 1 }
+
+# Splits an operand into its name and size. The name is the operand's first character followed by any letters, e.g. 'RM' of 'RM32', '1' of '1'
+def split_operand(operand: str) -> tuple[str, str]:
+    idx = 1
+    while idx < len(operand) and operand[idx].isalpha():
+        idx += 1
+    return operand[:idx].upper(), operand[idx:]
+
+def to_operand_type(operand: str) -> tuple[OperandType, int]:
+    name, size = split_operand(operand)
+
+    if name not in operand_types:
+        raise ParseException(f'Invalid operand: {operand}')
+    operandType, constantSize = operand_types[name]
+
+    if constantSize is not None:
+        if size and name != '1':
+            raise ParseException(f'Invalid operand: {operand}')
+        return operandType, constantSize
+    if size not in operand_sizes:
+        raise ParseException(f'Invalid operand size: {operand}')
+    return operandType, operand_sizes[size]
+
+def get_encoding_type(encodingType: str | None) -> int:
+    if not encodingType:
+        return 0
+    return sum(encoding_types[x.strip()] for x in encodingType.split('|'))
+
+def to_encoding_type(encodingType: set[str]) -> int:
+    result = 0
+    for x in encodingType:
+        if x not in encoding_types:
+            raise ParseException(f'Unsupported encoding type: {x}')
+        result |= encoding_types[x]
+    return result
+
+# Inverse of get_encoding_type. The flags are written in the order of encoding_types
+def encoding_type_to_string(encodingType: int) -> str:
+    return ' | '.join(name for name, flag in encoding_types.items() if encodingType & flag)
+
+# Kinds of the operands the assembler looks encodings up with (AssemblyExpr.*.ToAssemblerOperand), numbered by their position.
+# Mirrors Encoder.SignatureOperandTypes
+signature_operand_types = [
+    OperandType.A,
+    OperandType.C,
+    OperandType.R,
+    OperandType.XMM,
+    OperandType.M,
+    OperandType.MOFFS,
+    OperandType.IMM,
+    OperandType.One,
+]
+# A signature operand's size takes the low 5 bits of its byte, so only sizes below 32 can be looked up (32-byte operands are
+# matched by scanning the encodings). Mirrors Encoder.SignatureOperandSizeLimit
+signature_operand_size_limit = 1 << 5
+signature_operand_sizes = [1, 2, 4, 8, 16]
+
+# When an OperandType with a static size is combined with an OperandType with a variable size (e.g. XMMRM), the static size applies to the operand.
+# Mirrors Operand.constantSizeOperandTypeRM
+constant_size_operand_types = { OperandType.XMM : 16, OperandType.MMX : 8, OperandType.YMM : 32 }
+
+# Whether an operand passed to the assembler can be encoded as a schema operand. Mirrors Operand.Matches
+def matches(operand: tuple[OperandType, int], schema_operand: tuple[OperandType, int]) -> bool:
+    operandType, size = operand
+    schemaType, schemaSize = schema_operand
+
+    if (OperandType.IMM & schemaType) == schemaType:
+        sizeMatches = schemaSize >= size
+    elif operandType in constant_size_operand_types:
+        sizeMatches = constant_size_operand_types[operandType] == size
+    else:
+        sizeMatches = schemaSize == size
+
+    return (schemaType & operandType) == operandType and sizeMatches
+
+# One byte per operand: the index of its kind in signature_operand_types, and its size in bytes. Mirrors Encoder.TryGetSignature
+def to_signature_operand(operand: tuple[OperandType, int]) -> int:
+    operandType, size = operand
+    return signature_operand_types.index(operandType) << 5 | size
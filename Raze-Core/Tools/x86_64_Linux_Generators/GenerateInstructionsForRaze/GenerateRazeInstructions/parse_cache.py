@@ -0,0 +1,95 @@
+import os
+import pickle
+import hashlib
+import tempfile
+from typing import Any
+from get_operand import intern_operand
+from get_vex import Vex
+import table_types
+
+
+# The modules that turn a TSV row into encodings. Any change to them invalidates every cached row
+RULE_MODULES = [
+    'parse_instruction.py',
+    'to_raze_args.py',
+    'get_operand.py',
+    'get_opcode.py',
+    'get_vex.py',
+    'cpuid_features.py',
+    'get_encodingType.py',
+    'expand_unsized_operand.py',
+    'write_instruction.py',
+    'operand_types.py',
+    'string_instructions.py',
+]
+
+# (mnemonic, operands as (name, size, displaySize), opcode, encoding type, opcode extension, VEX fields, CPUID features)
+cached_encoding = tuple[str, tuple[tuple[str, int, bool], ...], bytes, int, int, tuple[int, ...] | None, tuple[str, ...]]
+
+def get_rules_version() -> str:
+    digest = hashlib.sha256()
+    for module in RULE_MODULES:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), module), 'rb') as fd:
+            digest.update(fd.read())
+    return digest.hexdigest()
+
+def to_cached_encoding(encoding: table_types.Encoding) -> cached_encoding:
+    return (
+        encoding.mnemonic,
+        tuple((x.name, x.size, x.displaySize) for x in encoding.operands),
+        encoding.opCode,
+        encoding.encodingType,
+        encoding.opCodeExtension,
+        tuple(encoding.vex) if encoding.vex is not None else None,
+        encoding.features
+    )
+
+def from_cached_encoding(encoding: cached_encoding) -> table_types.Encoding:
+    mnemonic, operands, opCode, encodingType, opCodeExtension, vex, features = encoding
+    return table_types.Encoding(
+        mnemonic, tuple(intern_operand(*x) for x in operands), opCode, encodingType, opCodeExtension, Vex(*vex) if vex is not None else None, features
+    )
+
+# Parse results of the rows of instructions.tsv, keyed by the hash of the row and the version of the parsing rules, along with the
+# schema written by the previous run (to diff the new schema against). Only the rows seen by the latest run are kept
+class ParseCache:
+    def __init__(self, file: str) -> None:
+        self.file = file
+        self.rulesVersion = get_rules_version()
+        self.rows: dict[str, tuple[list[cached_encoding], str | None]] = {}
+        self.usedRows: dict[str, tuple[list[cached_encoding], str | None]] = {}
+        self.schema: dict[str, Any] = {}
+        self.hits = 0
+
+        try:
+            with open(file, 'rb') as fd:
+                cache = pickle.load(fd)
+            self.rows, self.schema = cache['rows'], cache['schema']
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, KeyError):
+            pass
+
+    def key(self, row: list[str]) -> str:
+        return hashlib.sha256((self.rulesVersion + ':' + '\t'.join(row)).encode()).hexdigest()
+
+    # Returns the row's encodings and failure message (None if the row was parsed), or None if the row is not cached
+    def get(self, row: list[str]) -> tuple[list[table_types.Encoding], str | None] | None:
+        key = self.key(row)
+        if key not in self.rows:
+            return None
+
+        self.hits += 1
+        self.usedRows[key] = self.rows[key]
+        encodings, failure = self.rows[key]
+        return [from_cached_encoding(x) for x in encodings], failure
+
+    def put(self, row: list[str], encodings: list[table_types.Encoding], failure: str | None) -> None:
+        self.usedRows[self.key(row)] = ([to_cached_encoding(x) for x in encodings], failure)
+
+    def save(self, schema: dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.file))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so an interrupted run never leaves a partial cache
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'wb') as output:
+            pickle.dump({ 'rows' : self.usedRows, 'schema' : schema }, output, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.file)
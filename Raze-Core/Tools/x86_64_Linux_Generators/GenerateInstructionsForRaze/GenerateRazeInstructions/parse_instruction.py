@@ -1,7 +1,10 @@
 import sys
 from get_encodingType import get_encodingType
 from get_opcode import get_opcode, get_opcode_extension
+from get_vex import get_vex
+from cpuid_features import get_cpuid_features
 from to_raze_args import to_raze_args
+from string_instructions import get_suffixed_form, repeat_encoding_types
 from write_instruction import write_instruction
 import table_types
 
@@ -10,9 +13,10 @@ class Result:
         self.total = 0
         self.passed = 0
         self.failed = 0
+        self.pruned = 0
     
     def print_stats(self, instructions) -> None:
-        print(f"\n\n\nRESULT:\nTotal: {self.total}, Passed: {self.passed}, Skipped: {self.total-self.passed-self.failed} Failed: {self.failed}")
+        print(f"\n\n\nRESULT:\nTotal: {self.total}, Passed: {self.passed}, Skipped: {self.total-self.passed-self.failed} Failed: {self.failed}, Pruned: {self.pruned}")
         print(f"STATS:\nUnqiue-Instructions: {len(instructions)}, Percent Passed: {(self.passed/(self.passed+self.failed))*100:.2f}%, Percent Parsed: {((self.failed+self.passed)/self.total)*100:.2f}%")
         
         
@@ -21,9 +25,10 @@ def parse_instruction(
         r_opcode: str, 
         instruction: str, 
         operandEncoding: str, 
+        featureFlag: str,
         flags: str, 
         result: Result
-    ) -> None:
+    ) -> str | None:
 
     encodingType: set[str] = set()
 
@@ -36,10 +41,13 @@ def parse_instruction(
         opcode = get_opcode(r_opcode, encodingType)
         encodingType = get_encodingType(operands, operandEncoding, encodingType)
         opcodeExt = get_opcode_extension(r_opcode)
+        vex = get_vex(r_opcode, operands, operandEncoding)
+        features = get_cpuid_features(featureFlag)
     except Exception as e:
-        print("Instruction not parsed:\n", r_opcode, instruction, flags, "Reason: " + str(e), file=sys.stderr)
+        message = ' '.join(["Instruction not parsed:\n", r_opcode, instruction, flags, "Reason: " + str(e)])
+        print(message, file=sys.stderr)
         result.failed += 1
-        return
+        return message
 
     write_instruction(
         instructions, 
@@ -47,6 +55,11 @@ def parse_instruction(
         operands,
         opcode,
         encodingType,
-        opcodeExt
+        opcodeExt,
+        vex,
+        features
     )
+    if encodingType & repeat_encoding_types and (suffixed := get_suffixed_form(instruction_name, operands)):
+        write_instruction(instructions, suffixed, [], opcode, encodingType, opcodeExt, features=features)
     result.passed += 1
+    return None
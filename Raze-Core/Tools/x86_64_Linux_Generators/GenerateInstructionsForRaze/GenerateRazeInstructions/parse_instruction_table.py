@@ -1,17 +1,38 @@
 import sys
 import csv
-import json
+import argparse
 from parse_instruction import parse_instruction, Result
 from sort_instructions import sort_instructions
+from prune_instructions import prune_instructions, get_removal_reason, to_string
+from write_binary_schema import write_binary_schema
+from write_json_schema import write_json_schema
+from string_instructions import get_missing_string_instructions
+from compiler_instructions import get_compiler_instructions, get_missing_instructions, subset_instructions, DEFAULT_SOURCE_DIR
+from parse_cache import ParseCache
+from schema_patch import get_schema_patch
 import table_types
 
 
-table = sys.argv[1]
+parser = argparse.ArgumentParser()
+parser.add_argument('table', metavar='instructions.tsv')
+parser.add_argument('binary_schema', metavar='EncodingSchema.bin', nargs='?', help='Also write the precompiled (binary) schema to this file')
+parser.add_argument('--subset', metavar='SRC_DIR', nargs='?', const=DEFAULT_SOURCE_DIR,
+                    help="Keep only the mnemonics the compiler can emit (AssemblyExpr.Instruction and the inline assembly tables), read from the compiler's sources (default: Raze-Core/Src)")
+parser.add_argument('--all-features', action='store_true',
+                    help='Also parse the rows of the CPUID features the assembler does not support (AVX512, WAITPKG), which are skipped by default')
+parser.add_argument('--output', metavar='FILE', help='Write the JSON schema to FILE instead of stdout')
+parser.add_argument('--incremental', metavar='CACHE', help='Reuse the parse results of the rows unchanged since the run that wrote CACHE (and update it)')
+parser.add_argument('--patch', metavar='FILE', help='Write the encodings added, removed and changed since the run that wrote the --incremental cache to FILE')
+args = parser.parse_args()
+if args.patch and not args.incremental:
+    parser.error('--patch requires --incremental')
+
+cache = ParseCache(args.incremental) if args.incremental else None
 
 instructions: table_types.instruction_table = {}
 result: Result = Result()
 
-with open(table) as fd:
+with open(args.table) as fd:
     reader = csv.reader(fd, delimiter='\t')
     next(reader)
 
@@ -21,17 +42,72 @@ with open(table) as fd:
         opcode, instruction, operandEncoding, bit_mode, featureFlag, flags = row
 
         # Blacklist - unsupported features
-        if any([x in featureFlag for x in [ 'AVX512F', 'AVX512PF', 'AVX512VL', 'AVX', 'AVX2', 'AVX512DQ', 'FMA', 'WAITPKG' ]]):
+        if not args.all_features and any([x in featureFlag for x in [ 'AVX512', 'WAITPKG' ]]):
             continue
 
         if bit_mode.split('/')[0] != 'Valid':
             continue
         
-        parse_instruction(instructions, opcode, instruction, operandEncoding, flags, result)
+        if cache is None:
+            parse_instruction(instructions, opcode, instruction, operandEncoding, featureFlag, flags, result)
+            continue
+
+        if (cached := cache.get(row)) is not None:
+            encodings, failure = cached
+            if failure is None:
+                result.passed += 1
+            else:
+                print(failure, file=sys.stderr)
+                result.failed += 1
+        else:
+            rowInstructions: table_types.instruction_table = {}
+            failure = parse_instruction(rowInstructions, opcode, instruction, operandEncoding, featureFlag, flags, result)
+            encodings = [x for v in rowInstructions.values() for x in v]
+            cache.put(row, encodings, failure)
+
+        for encoding in encodings:
+            instructions.setdefault(encoding.mnemonic, []).append(encoding)
 
     for instruction in instructions:
-        instructions[instruction] = sort_instructions(instructions[instruction]) 
+        instructions[instruction], removed = prune_instructions(sort_instructions(instructions[instruction]))
+
+        for encoding, coveredBy in removed:
+            print(f"Encoding removed: {to_string(encoding)}, {get_removal_reason(encoding, coveredBy)}", file=sys.stderr)
+        result.pruned += len(removed)
+
+# Every mnemonic the compiler can emit must have been parsed. With --subset, the schema is also trimmed to them and a missing one is an error
+compilerInstructions = get_compiler_instructions(args.subset or DEFAULT_SOURCE_DIR)
+if args.subset:
+    instructions, missing = subset_instructions(instructions, compilerInstructions)
+    if missing:
+        print(f"Instructions used by the compiler missing from the schema ({len(missing)}): {', '.join(missing)}", file=sys.stderr)
+        exit(1)
+else:
+    missing = get_missing_instructions(instructions, compilerInstructions)
+    # The compiler does not emit string instructions, so they are only checked for in the full schema
+    missingStringInstructions = get_missing_string_instructions(instructions)
+
+if args.binary_schema:
+    write_binary_schema(instructions, args.binary_schema)
+
+if cache is not None:
+    schema = table_types.to_json(instructions)
+    patch = get_schema_patch(cache.schema, schema)
+    if args.patch:
+        with open(args.patch, 'w') as fd:
+            fd.write('\n'.join(patch.lines + [patch.summary()]) + '\n')
+    print(f"Incremental: {cache.hits} cached rows, {patch.summary()}", file=sys.stderr)
+    cache.save(schema)
 
+if args.output:
+    with open(args.output, 'w') as fd:
+        write_json_schema(instructions, fd)
+else:
+    write_json_schema(instructions, sys.stdout)
 
-print(json.dumps(instructions))
+for instruction in missing:
+    print(f"WARNING! Instruction {instruction} not parsed!")
+if not args.subset:
+    for instruction in missingStringInstructions:
+        print(f"WARNING! String instruction {instruction} not parsed!")
 result.print_stats(instructions)
@@ -0,0 +1,83 @@
+from operand_types import OperandType, encoding_types, encoding_type_to_string
+from get_vex import get_vex_string
+from cpuid_features import implies
+import table_types
+
+
+# Encoder.GetEncoding returns the first encoding (in schema order) that matches the operands (Encoding.Matches) and accepts them
+# (Encoding.SpecialMatch). An encoding is unreachable if an earlier encoding matches and accepts every operand it does
+
+# Encoding types SpecialMatch rejects some operands with. An earlier encoding with one of them only covers a later encoding with it as well
+immediate_encoding_types = encoding_types['SignExtends'] | encoding_types['ZeroExtends']
+# Encoding types that change which operands are accepted either way (upper 8-bit registers vs. SPL/BPL/SIL/DIL/R8B-R15B, and
+# the size given to label operands), or that only an instruction with the same repeat prefix is assembled with, so both encodings must
+# agree on them
+matching_encoding_types = encoding_types['NoUpper8BitEncoding'] | encoding_types['RelativeJump'] | encoding_types['RepPrefix'] | encoding_types['RepnePrefix']
+
+def covers_operand(operand: tuple[OperandType, int], covered: tuple[OperandType, int]) -> bool:
+    operandType, size = operand
+    coveredType, coveredSize = covered
+
+    if (operandType & coveredType) != coveredType:
+        return False
+    # An immediate is accepted by any encoding whose immediate is at least as large
+    if (OperandType.IMM & operandType) == operandType:
+        return size >= coveredSize
+    return size == coveredSize
+
+def covers(encoding: table_types.Encoding, covered: table_types.Encoding) -> bool:
+    operands, coveredOperands = encoding.operands, covered.operands
+
+    encodingType, coveredEncodingType = encoding.encodingType, covered.encodingType
+
+    if (encodingType & matching_encoding_types) != (coveredEncodingType & matching_encoding_types):
+        return False
+    # On a CPU without the earlier encoding's features, the later encoding is still selected, so every CPU running the later encoding
+    # must have them
+    if not implies(covered.features, encoding.features):
+        return False
+    # Nullary instructions are always assembled with the first encoding (with the same repeat prefix)
+    if not operands and not coveredOperands:
+        return True
+    if len(operands) != len(coveredOperands) or encoding.vex != covered.vex:
+        return False
+
+    if (encodingType & immediate_encoding_types) & ~coveredEncodingType:
+        return False
+
+    return all(covers_operand(x.get_schema_operand(), y.get_schema_operand()) for x, y in zip(operands, coveredOperands))
+
+# Removes the encodings of a mnemonic that an earlier encoding covers. Returns the remaining encodings (in order) and the removed ones,
+# each with the encoding that covers it
+def prune_instructions(
+        instructions: list[table_types.Encoding]
+    ) -> tuple[list[table_types.Encoding], list[tuple[table_types.Encoding, table_types.Encoding]]]:
+
+    result: list[table_types.Encoding] = []
+    removed: list[tuple[table_types.Encoding, table_types.Encoding]] = []
+
+    for instruction in instructions:
+        coveredBy = next((x for x in result if covers(x, instruction)), None)
+        if coveredBy is None:
+            result.append(instruction)
+        else:
+            removed.append((instruction, coveredBy))
+
+    return result, removed
+
+def to_string(instruction: table_types.Encoding) -> str:
+    result = f"{instruction.get_instruction()} ({instruction.get_opcode()}"
+    if instruction.opCodeExtension != -1:
+        result += f" /{instruction.opCodeExtension}"
+    if instruction.vex is not None:
+        result += f", {get_vex_string(instruction.vex)}"
+    if instruction.encodingType:
+        result += f", {encoding_type_to_string(instruction.encodingType)}"
+    if instruction.features:
+        result += f", {' '.join(instruction.features)}"
+    return result + ')'
+
+def get_removal_reason(instruction: table_types.Encoding, coveredBy: table_types.Encoding) -> str:
+    if all(getattr(instruction, x) == getattr(coveredBy, x) for x in ['mnemonic', 'operands', 'opCode', 'opCodeExtension', 'encodingType', 'vex', 'features']):
+        return 'duplicate of ' + to_string(coveredBy)
+    return 'covered by ' + to_string(coveredBy)
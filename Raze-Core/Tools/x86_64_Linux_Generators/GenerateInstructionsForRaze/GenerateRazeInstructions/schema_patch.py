@@ -0,0 +1,54 @@
+import difflib
+from typing import Any
+from get_vex import Vex, get_vex_string
+
+
+# Row-level diff of two JSON encoding schemas, per mnemonic. Encodings are compared in schema (priority) order, so a reordering shows up too
+class SchemaPatch:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.added = 0
+        self.removed = 0
+        self.changed = 0
+
+    def summary(self) -> str:
+        return f'Added: {self.added}, Removed: {self.removed}, Changed: {self.changed}'
+
+def to_string(entry: dict[str, Any]) -> str:
+    result = f"{entry['Instruction']} ({entry['OpCode']}"
+    if 'OpCodeExtension' in entry:
+        result += f" /{entry['OpCodeExtension']}"
+    if 'Vex' in entry:
+        result += f", {get_vex_string(Vex(**{ 'vvvv' : -1, **entry['Vex'] }))}"
+    if entry.get('EncodingType'):
+        result += f", {entry['EncodingType']}"
+    if entry.get('Features'):
+        result += f", {' '.join(entry['Features'])}"
+    result += ')'
+    if 'MinSize' in entry:
+        result += f" [{entry['MinSize']}-{entry['MaxSize']} bytes]"
+    return result
+
+def get_schema_patch(old: dict[str, list[dict[str, Any]]], new: dict[str, list[dict[str, Any]]]) -> SchemaPatch:
+    patch = SchemaPatch()
+
+    for mnemonic in list(old) + [x for x in new if x not in old]:
+        a = [to_string(x) for x in old.get(mnemonic, [])]
+        b = [to_string(x) for x in new.get(mnemonic, [])]
+        if a == b:
+            continue
+
+        patch.lines.append(f'@@ {mnemonic} @@')
+        for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+            if tag == 'equal':
+                continue
+
+            patch.lines += ['- ' + x for x in a[i1:i2]]
+            patch.lines += ['+ ' + x for x in b[j1:j2]]
+
+            if tag == 'replace':
+                patch.changed += min(i2 - i1, j2 - j1)
+            patch.removed += max(0, (i2 - i1) - (j2 - j1)) if tag == 'replace' else i2 - i1
+            patch.added += max(0, (j2 - j1) - (i2 - i1)) if tag == 'replace' else j2 - j1
+
+    return patch
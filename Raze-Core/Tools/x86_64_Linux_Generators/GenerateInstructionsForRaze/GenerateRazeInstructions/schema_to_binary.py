@@ -0,0 +1,15 @@
+import sys
+import json
+from write_binary_schema import write_binary_schema
+import table_types
+
+
+# Precompiles an existing JSON encoding schema (e.g. Raze-Core/Src/Assembly/Assembler/Resources/EncodingSchema.json) into its binary form
+if len(sys.argv) != 3:
+    print('Usage: schema_to_binary.py [EncodingSchema.json] [EncodingSchema.bin]')
+    exit(65)
+
+with open(sys.argv[1]) as fd:
+    instructions = table_types.from_json(json.load(fd))
+
+write_binary_schema(instructions, sys.argv[2])
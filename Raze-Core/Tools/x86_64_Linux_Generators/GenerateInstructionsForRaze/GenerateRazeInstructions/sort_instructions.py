@@ -1,46 +1,80 @@
+from operand_types import OperandType, encoding_types
 import table_types
 
 
-def opcode_size(opcode):
-    return len(opcode.split())
-
-operand_sizes = {
-    'IMM8' : 1,
-    'IMM16' : 2,
-    'IMM32' : 4,
-    'IMM64' : 8,
-
-    'MOFFS8' : 8,
-    'MOFFS16' : 8,
-    'MOFFS32' : 8,
-    'MOFFS64' : 8,
-}
-
-def operand_size(instruction: str) -> int:
-    _, *operands = instruction.split(' ', maxsplit=1)
-
-    if operands:
-        return sum([operand_sizes[operand] for operand in operands[0].split(', ') if operand in operand_sizes])
-    return 0
-        
-
-encodingtype_sizes = {
-    'RexPrefix' : 1,
-    'RexWPrefix' : 1,
-    'SizePrefix' : 1,
-    'NoModRegRM' : -1,
-    'SignExtends' : 0,
-    'ZeroExtends' : 0,
-    'AddRegisterToOpCode' : 0,
-    'RelativeJump' : 0,
-    'NoUpper8BitEncoding' : 0,
-}
-
-def encodingType_size(encodingType: str) -> int:
-    return sum(encodingtype_sizes[x] for x in encodingType.split(' | ')) if encodingType != None else 0
-
-def get_instruction_size(instruction: table_types.instruction_table_entry) -> int:
-    return opcode_size(instruction['OpCode']) + operand_size(instruction['Instruction']) + encodingType_size(instruction.get('EncodingType'))
-
-def sort_instructions(instructions: table_types.instruction_table):
-    return sorted(instructions, key=get_instruction_size)
+# Encoded length of a schema entry, as the assembler emits it (Assembler.VisitBinary/VisitUnary):
+#   [0x67] [F2/F3] [0x66] [REX] opcode [ModRM] [SIB] [displacement] [immediate]
+# or, for VEX encodings (which fold the mandatory prefix, REX and the opcode map into the VEX prefix):
+#   [0x67] VEX opcode [ModRM] [SIB] [displacement] [immediate]
+# The length depends on the operands the entry is assembled with (e.g. a register or a memory operand for RM, r8-r15 needing a REX prefix),
+# so every entry has a shortest and a longest encoding
+
+# Operands that may name r8-r15 (or xmm8-xmm15/ymm8-ymm15) as a register or as the base of a memory operand, requiring a REX prefix
+def is_extendable(operandType: OperandType) -> bool:
+    return (operandType & OperandType.RNA) == OperandType.RNA or bool(operandType & (OperandType.M | OperandType.XMM | OperandType.YMM))
+
+# The 2-byte VEX prefix (C5) only encodes the 0F opcode map, W0 and REX.R. Anything else (REX.X/REX.B, i.e. an extended base or index
+# register) needs the 3-byte form (C4)
+VEX2_SIZE = 2
+VEX3_SIZE = 3
+
+# A memory operand is [base], [base + disp8], [base + disp32], [rsp/r12 + ...] (needing a SIB byte), or [rip + disp32]
+MAX_SIB_SIZE = 1
+MAX_DISPLACEMENT_SIZE = 4
+# A memory offset is always encoded as a 64-bit absolute address, without a ModRM byte
+MOFFS_SIZE = 8
+
+def has_modrm(operands: list[tuple[OperandType, int]], encodingType: int) -> bool:
+    if not operands or encodingType & encoding_types['NoModRegRM']:
+        return False
+    if any(operandType == OperandType.MOFFS for operandType, _ in operands):
+        return False
+    # A unary immediate operand (e.g. JMP IMM32, PUSH IMM32, INT IMM8) is encoded without a ModRM byte
+    return not (len(operands) == 1 and operands[0][0] & OperandType.IMM)
+
+def get_immediate_size(operandType: OperandType, size: int) -> int:
+    if operandType == OperandType.One:
+        return 0
+    if operandType == OperandType.MOFFS:
+        return MOFFS_SIZE
+    return size if operandType == OperandType.IMM else 0
+
+def get_instruction_size(instruction: table_types.Encoding) -> tuple[int, int]:
+    operands = [x.get_schema_operand() for x in instruction.operands]
+    encodingType = instruction.encodingType
+
+    size = len(instruction.opCode) + sum(get_immediate_size(*operand) for operand in operands)
+    variable = 0
+
+    if instruction.vex is not None:
+        if instruction.vex.mmmmm != 1 or instruction.vex.W:
+            size += VEX3_SIZE
+        else:
+            size += VEX2_SIZE
+            if any(is_extendable(operandType) for operandType, _ in operands):
+                variable += VEX3_SIZE - VEX2_SIZE
+    else:
+        if encodingType & (encoding_types['RepPrefix'] | encoding_types['RepnePrefix']):
+            size += 1
+        if encodingType & encoding_types['SizePrefix']:
+            size += 1
+        if encodingType & (encoding_types['RexPrefix'] | encoding_types['RexWPrefix']):
+            size += 1
+        elif any(is_extendable(operandType) for operandType, _ in operands):
+            variable += 1
+    if has_modrm(operands, encodingType):
+        size += 1
+
+    if any(operandType & OperandType.M for operandType, _ in operands):
+        # 0x67 (32-bit address register), SIB and displacement
+        variable += 1 + MAX_SIB_SIZE + MAX_DISPLACEMENT_SIZE
+
+    return size, size + variable
+
+# Orders the encodings of a mnemonic from the shortest to the longest, so the assembler (which picks the first matching encoding) selects
+# the shortest encoding of the operands. The sort is stable, keeping the table's order between encodings of equal length.
+# Each entry's length is kept in the schema as MinSize/MaxSize
+def sort_instructions(instructions: list[table_types.Encoding]) -> list[table_types.Encoding]:
+    for instruction in instructions:
+        instruction.minSize, instruction.maxSize = get_instruction_size(instruction)
+    return sorted(instructions, key=lambda x: (x.minSize, x.maxSize))
@@ -0,0 +1,56 @@
+from get_operand import Operand
+from operand_types import encoding_types
+import table_types
+
+
+# Repeat prefixes of the string instructions (Intel SDM Vol. 2, REP/REPE/REPZ/REPNE/REPNZ). The prefix byte (F3 or F2) is kept as an
+# encoding type rather than as part of the opcode
+repeat_prefixes = {
+    'REP' : 'RepPrefix',
+    'REPE' : 'RepPrefix',
+    'REPZ' : 'RepPrefix',
+    'REPNE' : 'RepnePrefix',
+    'REPNZ' : 'RepnePrefix',
+}
+repeat_encoding_types = encoding_types['RepPrefix'] | encoding_types['RepnePrefix']
+
+# The string instructions and the repeat prefixes each takes
+string_instructions = {
+    'MOVS' : ['REP'],
+    'STOS' : ['REP'],
+    'LODS' : ['REP'],
+    'INS' : ['REP'],
+    'OUTS' : ['REP'],
+    'CMPS' : ['REPE', 'REPNE'],
+    'SCAS' : ['REPE', 'REPNE'],
+}
+size_suffixes = { 8 : 'B', 16 : 'W', 32 : 'D', 64 : 'Q' }
+# INS and OUTS have no 64-bit form
+no_quadword_string_instructions = { 'INS', 'OUTS' }
+
+# The repeat prefix rows only list the explicit operand form of a string instruction (e.g. REP MOVS m8, m8), which is also encoded as the
+# operand-size suffixed form without operands (REP MOVSB). Returns the suffixed mnemonic, or None if the instruction is not a string instruction
+def get_suffixed_form(mnemonic: str, operands: list[Operand]) -> str | None:
+    if mnemonic not in string_instructions or not operands:
+        return None
+    # The size is given by the memory operand (INS m8, DX / OUTS DX, m8), or the accumulator (LODS AL)
+    operand = next((x for x in operands if x.name == 'M'), operands[0])
+    if operand.size not in size_suffixes:
+        return None
+    return mnemonic + size_suffixes[operand.size]
+
+# The suffixed string instructions (e.g. MOVSB, REP MOVSB, REPNE SCASQ) without an encoding in the schema
+def get_missing_string_instructions(instructions: table_types.instruction_table) -> list[str]:
+    missing: list[str] = []
+
+    for mnemonic, prefixes in string_instructions.items():
+        for size, suffix in size_suffixes.items():
+            if size == 64 and mnemonic in no_quadword_string_instructions:
+                continue
+
+            encodings = [x for x in instructions.get(mnemonic + suffix, []) if not x.operands]
+            for prefix in [None] + prefixes:
+                encodingType = encoding_types[repeat_prefixes[prefix]] if prefix else 0
+                if not any((x.encodingType & repeat_encoding_types) == encodingType for x in encodings):
+                    missing.append((prefix + ' ' if prefix else '') + mnemonic + suffix)
+    return missing
@@ -1,2 +1,74 @@
-instruction_table_entry = dict[str, str | int]
-instruction_table = dict[str, list[instruction_table_entry]]
+from typing import Any
+from get_operand import Operand, parse_schema_operand
+from get_vex import Vex
+from operand_types import get_encoding_type, encoding_type_to_string
+
+
+# One encoding of a mnemonic, as it flows through parsing, expansion, sorting and pruning. It is only formatted as text
+# (the 'Instruction', 'OpCode' and 'EncodingType' strings of the JSON schema) when serialized
+class Encoding:
+    __slots__ = ('mnemonic', 'operands', 'opCode', 'encodingType', 'opCodeExtension', 'vex', 'features', 'minSize', 'maxSize')
+
+    def __init__(self, mnemonic: str, operands: tuple[Operand, ...], opCode: bytes, encodingType: int, opCodeExtension: int, vex: Vex | None = None, features: tuple[str, ...] = ()) -> None:
+        self.mnemonic = mnemonic
+        self.operands = operands
+        self.opCode = opCode
+        # Bitmask of operand_types.encoding_types
+        self.encodingType = encodingType
+        # -1 when the opcode has no extension
+        self.opCodeExtension = opCodeExtension
+        # None for legacy (non-VEX) encodings
+        self.vex = vex
+        # CPUID features the encoding requires, see cpuid_features.get_cpuid_features
+        self.features = features
+        # Encoded length in bytes, see sort_instructions.get_instruction_size
+        self.minSize: int | None = None
+        self.maxSize: int | None = None
+
+    def get_instruction(self) -> str:
+        return self.mnemonic + (' ' if self.operands else '') + ', '.join([str(x) for x in self.operands])
+
+    def get_opcode(self) -> str:
+        return ' '.join(f'{x:02X}' for x in self.opCode)
+
+    def to_json(self) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            'Instruction': self.get_instruction(),
+            'OpCode': self.get_opcode()
+        }
+        if self.encodingType:
+            result['EncodingType'] = encoding_type_to_string(self.encodingType)
+        if self.opCodeExtension != -1:
+            result['OpCodeExtension'] = self.opCodeExtension
+        if self.vex is not None:
+            result['Vex'] = { k : v for k, v in self.vex._asdict().items() if k != 'vvvv' or v != -1 }
+        if self.features:
+            result['Features'] = list(self.features)
+        if self.minSize is not None:
+            result['MinSize'] = self.minSize
+            result['MaxSize'] = self.maxSize
+        return result
+
+    @staticmethod
+    def from_json(entry: dict[str, Any]) -> 'Encoding':
+        mnemonic, *operands = str(entry['Instruction']).split(' ', maxsplit=1)
+        encoding = Encoding(
+            mnemonic,
+            tuple(parse_schema_operand(x) for x in operands[0].split(', ')) if operands else (),
+            bytes(int(x, 16) for x in str(entry['OpCode']).split()),
+            get_encoding_type(entry.get('EncodingType')),
+            int(entry.get('OpCodeExtension', -1)),
+            Vex(**{ 'vvvv' : -1, **entry['Vex'] }) if 'Vex' in entry else None,
+            tuple(entry.get('Features', ()))
+        )
+        if 'MinSize' in entry:
+            encoding.minSize, encoding.maxSize = int(entry['MinSize']), int(entry['MaxSize'])
+        return encoding
+
+instruction_table = dict[str, list[Encoding]]
+
+def to_json(instructions: instruction_table) -> dict[str, list[dict[str, Any]]]:
+    return { k : [x.to_json() for x in v] for k, v in instructions.items() }
+
+def from_json(instructions: dict[str, list[dict[str, Any]]]) -> instruction_table:
+    return { k : [Encoding.from_json(x) for x in v] for k, v in instructions.items() }
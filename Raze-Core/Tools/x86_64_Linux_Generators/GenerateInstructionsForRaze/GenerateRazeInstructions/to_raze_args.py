@@ -1,5 +1,6 @@
 from parse_exception import ParseException
 from get_operand import Operand, get_operand
+from string_instructions import repeat_prefixes
 
 FORCE_SIZE_PREFIX = {
     'CBW', 'CWD',
@@ -13,9 +14,10 @@ OP2_SIZE_PREFIX = {
 def to_raze_args(instruction: str, encodingType: set[str]) -> tuple[str, list[Operand]]:
     result: list[Operand] = []
     
-    # Note: REP/REPE/REPZ/REPNE/REPNZ opcode flags are not currently supported
-    if instruction.startswith(('REP', 'REPE', 'REPZ', 'REPNE', 'REPNZ')):
-        instruction = instruction.split(' ', maxsplit=1)[1]
+    prefix, _, prefixed = instruction.partition(' ')
+    if prefix in repeat_prefixes:
+        encodingType.add(repeat_prefixes[prefix])
+        instruction = prefixed
 
     instruction, *operands = instruction.split(' ', maxsplit=1)
     if operands:
@@ -25,7 +27,7 @@ def to_raze_args(instruction: str, encodingType: set[str]) -> tuple[str, list[Op
         match operand.size:
             case -1:
                 raise ParseException('Unset size')
-            case size if size > 0 and size not in (8, 16, 32, 64, 128):
+            case size if size > 0 and size not in (8, 16, 32, 64, 128, 256):
                 raise ParseException(f'Unsupported size: {size}')
 
     if instruction in FORCE_SIZE_PREFIX:
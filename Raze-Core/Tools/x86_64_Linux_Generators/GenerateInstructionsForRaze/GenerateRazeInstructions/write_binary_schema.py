@@ -0,0 +1,54 @@
+import struct
+from encoding_index import get_encoding_index
+import table_types
+
+
+# Precompiled form of the encoding schema, read by Assembler.Encoder.ReadEncodingSchema (Raze-Core/Src/Assembly/Assembler/ReadEncodingSchema.cs).
+# All integers are little-endian:
+#   header:   magic 'RZES', u16 version, u16 mnemonic count, u8 CPUID feature count, features (u8 name length, ASCII name)
+#   mnemonic: u8 name length, ASCII name, u16 encoding count, encodings (in priority order), u16 index entry count, index entries
+#   encoding: u16 EncodingTypes bitmask, u8 opcode extension, u8 opcode length, u8 operand count, opcode bytes, operands, u8 has VEX,
+#             VEX fields (if it has VEX), u8 feature count, u8 indices of the required features (in the header's features)
+#   operand:  u32 OperandType flags, u8 OperandSize (in bytes)
+#   VEX fields: u8 L, u8 pp, u8 mmmmm, u8 W, s8 vvvv (index of the operand encoded in VEX.vvvv, or -1)
+#   index entry: u8 operand count, operand signature (a byte per operand, see operand_types.to_signature_operand),
+#                u8 candidate count, u8 indices of the matching encodings (in priority order)
+# Bump SCHEMA_VERSION on any layout change, along with the reader's
+SCHEMA_MAGIC = b'RZES'
+SCHEMA_VERSION = 4
+
+def to_binary_schema(instructions: table_types.instruction_table) -> bytes:
+    result = bytearray(struct.pack('<4sHH', SCHEMA_MAGIC, SCHEMA_VERSION, len(instructions)))
+
+    features = list(dict.fromkeys(x for encodings in instructions.values() for encoding in encodings for x in encoding.features))
+    featureIndices = { x : i for i, x in enumerate(features) }
+    result += struct.pack('<B', len(features))
+    for feature in features:
+        name = feature.encode('ascii')
+        result += struct.pack('<B', len(name)) + name
+
+    for mnemonic, encodings in instructions.items():
+        name = mnemonic.encode('ascii')
+        result += struct.pack('<B', len(name)) + name + struct.pack('<H', len(encodings))
+
+        for encoding in encodings:
+            result += struct.pack('<HBBB', encoding.encodingType, max(encoding.opCodeExtension, 0), len(encoding.opCode), len(encoding.operands))
+            result += encoding.opCode
+            for operand in encoding.operands:
+                result += struct.pack('<IB', *operand.get_schema_operand())
+            if encoding.vex is None:
+                result += struct.pack('<B', 0)
+            else:
+                result += struct.pack('<BBBBBb', 1, *encoding.vex)
+            result += struct.pack('<B', len(encoding.features)) + bytes(featureIndices[x] for x in encoding.features)
+
+        index = get_encoding_index(encodings)
+        result += struct.pack('<H', len(index))
+        for signature, candidates in index.items():
+            result += struct.pack('<B', len(signature)) + signature + struct.pack('<B', len(candidates)) + bytes(candidates)
+
+    return bytes(result)
+
+def write_binary_schema(instructions: table_types.instruction_table, file: str) -> None:
+    with open(file, 'wb') as fd:
+        fd.write(to_binary_schema(instructions))
@@ -1,5 +1,6 @@
 import expand_unsized_operand as eU 
 from get_operand import Operand
+from get_vex import Vex
 import table_types
 
 
@@ -7,12 +8,14 @@ def write_instruction(
         instructions: table_types.instruction_table, 
         instruction_name: str, 
         operands: list[Operand],
-        opcode: str, 
-        encodingType: str, 
-        opCodeExt: int
+        opcode: bytes, 
+        encodingType: int, 
+        opCodeExt: int,
+        vex: Vex | None = None,
+        features: tuple[str, ...] = ()
     ) -> None:
     
-    if eU.expand_unsized_operand(instructions, instruction_name, operands, opcode, encodingType, opCodeExt):
+    if eU.expand_unsized_operand(instructions, instruction_name, operands, opcode, encodingType, opCodeExt, vex, features):
         return
     else:
         _write_instruction(
@@ -21,28 +24,23 @@ def write_instruction(
             operands,
             opcode,
             encodingType,
-            opCodeExt
+            opCodeExt,
+            vex,
+            features
         )
 
 def _write_instruction(
         instructions: table_types.instruction_table, 
         instruction_name: str, 
         operands: list[Operand], 
-        opcode: str, 
-        encodingType: str, 
-        opCodeExt: int
+        opcode: bytes, 
+        encodingType: int, 
+        opCodeExt: int,
+        vex: Vex | None,
+        features: tuple[str, ...]
     ) -> None:
     
     if instruction_name not in instructions:
         instructions[instruction_name] = []
 
-    instructions[instruction_name].append({
-        'Instruction': instruction_name + (' ' if operands else '') + ', '.join([str(x) for x in operands]),
-        'OpCode': opcode
-    })
-
-    if encodingType:
-        instructions[instruction_name][-1]['EncodingType'] = encodingType
-        
-    if opCodeExt != -1:
-        instructions[instruction_name][-1]['OpCodeExtension'] = opCodeExt
+    instructions[instruction_name].append(table_types.Encoding(instruction_name, tuple(operands), opcode, encodingType, opCodeExt, vex, features))
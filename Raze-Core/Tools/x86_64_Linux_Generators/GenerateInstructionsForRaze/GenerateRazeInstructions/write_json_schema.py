@@ -0,0 +1,16 @@
+import json
+from typing import TextIO
+import table_types
+
+
+# Writes the JSON encoding schema one mnemonic at a time, without building the whole document in memory.
+# Mnemonics are written in sorted order, and the keys of each encoding in the order of Encoding.to_json, so regenerating an unchanged
+# table gives an identical file. The layout is that of json.dump(schema, fd, indent=2)
+INDENT = '  '
+
+def write_json_schema(instructions: table_types.instruction_table, fd: TextIO) -> None:
+    fd.write('{')
+    for idx, mnemonic in enumerate(sorted(instructions)):
+        encodings = json.dumps([x.to_json() for x in instructions[mnemonic]], indent=len(INDENT)).replace('\n', '\n' + INDENT)
+        fd.write(('\n' if idx == 0 else ',\n') + INDENT + json.dumps(mnemonic) + ': ' + encodings)
+    fd.write('\n}\n' if instructions else '}\n')
@@ -2,6 +2,18 @@ INTEL_SDM_VOL2_ABCD_URL="https://cdrdv2-public.intel.com/825760/325383-sdm-vol-2
 
 OUTPUT_DIR=$(pwd)
 
+# By default only the mnemonics the compiler can emit are kept, and the rows of unsupported CPUID features (AVX512, WAITPKG) are skipped.
+# With --unfiltered, every mnemonic and feature is kept, and only the JSON schema is written (to output.full.json)
+SCHEMA="$OUTPUT_DIR/output.json"
+PARSE_ARGS=("$OUTPUT_DIR/EncodingSchema.bin" --subset --output "$SCHEMA")
+if [ "$1" == "--unfiltered" ]; then
+    SCHEMA="$OUTPUT_DIR/output.full.json"
+    PARSE_ARGS=(--all-features --output "$SCHEMA")
+fi
+
+# Offline instruction timing dataset (uops.info's instructions.xml). When present, a per-microarchitecture cost table is written to CostTable.json
+INSTRUCTION_COSTS="${INSTRUCTION_COSTS:-$OUTPUT_DIR/InstructionCosts/instructions.xml}"
+
 dir=$(mktemp -d)
 cd $dir
 
@@ -11,35 +23,33 @@ echo "Done"
 
 # Dependencies:
 #   Python:
-#       python3.10+, tabula-py, tabula-py[jpype], tabulate
-#   Java:
+#       python3.10+, tabula-py, tabula-py[jpype], tabulate, pypdf
+#       pdfplumber (only for --backend native)
+#   Java (not needed with --backend native):
 #       default-jre, openjdk-11-jre-headless, openjdk-8-jre-headless
 
 
 echo "Scraping SDM PDF. This may take some time..."
-python3 "$OUTPUT_DIR/GenerateInstructionTable/generate_instruction_table.py" "./sdm.pdf" > /dev/null
+python3 "$OUTPUT_DIR/GenerateInstructionTable/generate_instruction_table.py" "./sdm.pdf" --workers "$(nproc)" > /dev/null
 echo "Done"
 
 echo "Correcting instructions..."
 "$OUTPUT_DIR/GenerateInstructionTable/corrections.sh"
 echo "Done"
 
-echo "Parsing instructions..."
-instructions=$(python3.10 "$OUTPUT_DIR/GenerateRazeInstructions/parse_instruction_table.py" "instructions.tsv" 2> /dev/null) 
-echo "Done"
-
-echo "Validating..."
-a=("ADD,SUB,MOV,CALL,PUSH,LEA,CMP,SETE,JMP,JE,JNE,TEST,SYSCALL,SETNE,SETG,SETL,SETGE,SETLE,SETA,SETAE,SETB,SETBE,JG,JL,JGE,JLE,JA,JAE,JB,JBE,INC,DEC,NEG,SHR,SHL,IDIV,DIV,IMUL,MUL,NOT,OR,AND,XOR,MOVSX,MOVZX,SAL,SAR,RET,POP,LEAVE,CWD,CDQ,CQO,CMOVNZ,MOVSS,ADDSS,CVTTSS2SI,MOVD,MOVQ,CBW,CWDE,CDQE,CVTSS2SD,ADDSD,CVTSD2SI,CVTSD2SS")
-IFS=', ' read -r -a array <<< "$a" 
-for i in "${array[@]}" 
-do 
-    lines=$(echo $instructions | grep "\"$i\":" -o | wc -l)
-    if [[ "$lines" == "0" ]]; then
-        echo "WARNING! Instruction "$i" not parsed!"
-    fi
-done
+echo "Parsing and validating instructions..."
+# Fails if any of the mnemonics the compiler can emit could not be parsed
+if ! python3.10 "$OUTPUT_DIR/GenerateRazeInstructions/parse_instruction_table.py" "instructions.tsv" "${PARSE_ARGS[@]}" > /dev/null 2> "parse.log"; then
+    tail -n 1 "parse.log"
+    rm -r $dir
+    exit 1
+fi
 echo "Done"
 
-echo $instructions > "$OUTPUT_DIR/output.json"
+if [ -f "$INSTRUCTION_COSTS" ]; then
+    echo "Joining instruction costs..."
+    python3.10 "$OUTPUT_DIR/GenerateRazeInstructions/generate_cost_table.py" "$INSTRUCTION_COSTS" "$SCHEMA" --output "$OUTPUT_DIR/CostTable.json"
+    echo "Done"
+fi
 
 rm -r $dir 
@@ -0,0 +1,131 @@
+import re
+from typing import Iterator, NamedTuple
+
+# Indexes the function declarations of a C header (e.g. include/linux/syscalls.h) by name, in one pass over the header.
+# Comments and preprocessor directives are dropped, and the rest is tokenized and split into top-level declarations, so
+# prototypes spanning several lines and `static inline` definitions are handled alike
+
+# Words that precede a declaration's return type
+SPECIFIERS = { 'asmlinkage', 'static', 'inline', 'extern', 'notrace' }
+
+TOKEN_PATTERN = re.compile(r'[A-Za-z_][A-Za-z_0-9]*|0[xX][0-9a-fA-F]+|[0-9]+|\.\.\.|\S')
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/|//[^\n]*', re.DOTALL)
+# A directive, including its backslash-continued lines
+DIRECTIVE_PATTERN = re.compile(r'^[ \t]*#(?:[^\n]*\\\n)*[^\n]*', re.MULTILINE)
+
+class Declaration(NamedTuple):
+    specifiers: tuple[str, ...]
+    return_type: str
+    name: str
+    # One string per parameter, e.g. 'char __user *buf', or ('void',)
+    parameters: tuple[str, ...]
+
+    def __str__(self) -> str:
+        return ' '.join(self.specifiers + (self.return_type, f"{self.name}({', '.join(self.parameters)});"))
+
+def tokenize(source: str) -> list[str]:
+    source = COMMENT_PATTERN.sub(' ', source)
+    source = DIRECTIVE_PATTERN.sub('', source)
+    return TOKEN_PATTERN.findall(source)
+
+# Joins tokens the way the kernel writes declarations: 'char __user *buf', 'unsigned long *'
+def join_tokens(tokens: list[str]) -> str:
+    result = ' '.join(tokens)
+    result = re.sub(r'\* (?=[A-Za-z_*])', '*', result)
+    result = re.sub(r' ?([\[\]]) ?', r'\1', result)
+    return result
+
+# Splits tokens at the commas outside of parentheses and brackets
+def split_parameters(tokens: list[str]) -> list[list[str]]:
+    result: list[list[str]] = [[]]
+    depth = 0
+    for token in tokens:
+        if token in ('(', '['):
+            depth += 1
+        elif token in (')', ']'):
+            depth -= 1
+        elif token == ',' and depth == 0:
+            result.append([])
+            continue
+        result[-1].append(token)
+    return result if result != [[]] else []
+
+# Drops attribute macros with arguments, e.g. __printf(1, 2), __attribute__((noreturn))
+def strip_attributes(tokens: list[str]) -> list[str]:
+    result: list[str] = []
+    depth = 0
+    for token in tokens:
+        if depth:
+            depth += { '(' : 1, ')' : -1 }.get(token, 0)
+        elif token == '(' and result and result[-1].startswith('__'):
+            result.pop()
+            depth = 1
+        else:
+            result.append(token)
+    return result
+
+# The declaration of a top-level statement's tokens, or None if it does not declare a function. The function's name is the first
+# identifier followed by a parameter list, skipping attribute macros (__attribute__, __printf, ...), which are all '__'-prefixed
+def parse_declaration(tokens: list[str]) -> Declaration | None:
+    if 'typedef' in tokens:
+        return None
+
+    depth = 0
+    for idx, token in enumerate(tokens):
+        if token == '(':
+            if depth == 0 and idx > 0 and re.fullmatch(r'[A-Za-z_][A-Za-z_0-9]*', tokens[idx - 1]) and not tokens[idx - 1].startswith('__'):
+                break
+            depth += 1
+        elif token == ')':
+            depth -= 1
+    else:
+        return None
+
+    end = idx + 1
+    depth = 1
+    while end < len(tokens) and depth:
+        depth += { '(' : 1, ')' : -1 }.get(tokens[end], 0)
+        end += 1
+    if depth:
+        return None
+
+    prefix = strip_attributes(tokens[:idx - 1])
+    specifiers = tuple(x for x in prefix if x in SPECIFIERS)
+    return_type = [x for x in prefix if x not in SPECIFIERS]
+    if not return_type:
+        return None
+
+    return Declaration(specifiers, join_tokens(return_type), tokens[idx - 1], tuple(join_tokens(x) for x in split_parameters(tokens[idx + 1:end - 1])))
+
+# Top-level statements: split at ';' and at the braces of definitions (whose bodies are skipped)
+def get_statements(tokens: list[str]) -> Iterator[list[str]]:
+    statement: list[str] = []
+    depth = 0
+    for token in tokens:
+        if depth:
+            depth += { '{' : 1, '}' : -1 }.get(token, 0)
+        elif token == '{':
+            depth = 1
+            yield statement
+            statement = []
+        elif token == ';':
+            yield statement
+            statement = []
+        else:
+            statement.append(token)
+
+# Name -> declaration. A name declared more than once (e.g. on both sides of an #ifdef) keeps its first declaration
+def index_declarations(source: str) -> dict[str, Declaration]:
+    result: dict[str, Declaration] = {}
+    for statement in get_statements(tokenize(source)):
+        if (declaration := parse_declaration(statement)) is not None:
+            result.setdefault(declaration.name, declaration)
+    return result
+
+def index_files(files: list[str]) -> dict[str, Declaration]:
+    result: dict[str, Declaration] = {}
+    for file in files:
+        with open(file) as fd:
+            for name, declaration in index_declarations(fd.read()).items():
+                result.setdefault(name, declaration)
+    return result
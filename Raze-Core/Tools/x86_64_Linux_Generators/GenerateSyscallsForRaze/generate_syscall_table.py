@@ -1,10 +1,23 @@
 import os
-import sys
 import re
 import json
-
-RESOURCES_DIR = sys.argv[1]
-INPUT_FILE = sys.argv[2]
+import argparse
+from declaration_index import Declaration, index_declarations, index_files
+from struct_layout import StructLayout, LayoutCalculator, to_class_name
+from uapi_constants import generate_constants_module
+from vdso import generate_vdso_mark, generate_vdso_wrapper, generate_vdso_class
+
+parser = argparse.ArgumentParser()
+parser.add_argument('resources_dir', metavar='RESOURCES_DIR', help='Directory of types.json, class_definitions.json, syscall_declarations.json and vdso_syscalls.json')
+parser.add_argument('table', metavar='syscall_64.tbl')
+parser.add_argument('headers', metavar='syscalls.h', nargs='+', help='Headers declaring the syscalls, searched in order')
+parser.add_argument('--output', default='output.rz')
+parser.add_argument('--uapi-include', metavar='DIR', help='uapi include directory (e.g. /usr/include) to extract the constants of uapi_constants.json from')
+parser.add_argument('--constants-output', default='constants.rz', help='Raze module the uapi constants are written to (with --uapi-include)')
+parser.add_argument('--inline', action='store_true', help='Emit inline syscall functions, whose arguments are allocated to the syscall\'s registers instead of being moved to them')
+args = parser.parse_args()
+
+RESOURCES_DIR = args.resources_dir
 
 with open(os.path.join(RESOURCES_DIR, 'types.json')) as types:
     typeConversionTable = json.load(types)
@@ -93,34 +106,36 @@ def get_inline_asm_instructions(typeInfo, args, function_return_type):
     return (return_type_name, allocs, result)
 
 
-lastNum = '0'
-
-def generate_syscall_function(syscall: list[str]) -> str:
-    global lastNum
+# Entries of the 64-bit ABI: number, ABI (common or 64), name, entry point (e.g. '0	common	read	sys_read')
+SYSCALL_TABLE_ENTRY = re.compile(r'^([0-9]+)\s+(?:common|64)\s+[a-zA-Z_0-9]+\s+([a-zA-Z_0-9]+)', re.MULTILINE)
 
-    syscall = syscall[:-1]
+# (number, entry point) of each syscall, e.g. ('0', 'sys_read')
+def read_syscall_table(file: str) -> list[tuple[str, str]]:
+    with open(file) as fd:
+        return SYSCALL_TABLE_ENTRY.findall(fd.read())
 
-    if len(syscall) == 1:
-        print("WARNING: No information on syscall #" + syscall[0] + ". Skipping...")
-        return ''
-    
-    if not syscall[0].split()[0].isnumeric():
-        syscall.insert(0, lastNum)
-    else:
-        lastNum = syscall[0].split()[0]
+# The declaration of a syscall's entry point. syscall_declarations.json lists the entry points declared under another name (aliases),
+# those to skip, and declarations for the entry points the headers do not declare (e.g. the x86-specific ones)
+def get_declaration(entry: str, declarations: dict[str, Declaration], special: dict) -> Declaration | None:
+    if entry in special['skipped']:
+        return None
+    return declarations.get(special['aliases'].get(entry, entry))
 
-    _, function_return_type, function_name = syscall[1].split()
-    function_name = function_name.upper()
+# An inline function has no call frame: its body is generated in the caller, where the values MOVed to the allocated registers are
+# allocated to them when possible (the MOVs of the arguments bind them to their registers), so e.g. a write is a few MOVs and the SYSCALL
+def generate_syscall_function(number: str, entry: str, declaration: Declaration, vdso: dict | None = None, inline: bool = False) -> str:
+    function_name = entry.upper()
     
-    typeInfo, function_arguments = format_arguments(syscall[2:])
+    typeInfo, function_arguments = format_arguments(list(declaration.parameters))
 
     if function_arguments == None:
         return ''
 
-    return_type_name, function_allocs, function_instructions = get_inline_asm_instructions(typeInfo, [syscall[0]] + syscall[2:], function_return_type)
+    return_type_name, function_allocs, function_instructions = get_inline_asm_instructions(typeInfo, [number, *declaration.parameters], declaration.return_type)
 
     return ( ''
-        f'function unsafe static {return_type_name}{function_name}({function_arguments})\n'
+        f'{generate_vdso_mark(vdso["symbol"], function_name) if vdso else ""}'
+        f'function unsafe {"inline " if inline else ""}static {return_type_name}{function_name}({function_arguments})\n'
         f'{{\n'
         f'\tasm {{\n'
         f'{function_allocs}\n'
@@ -129,31 +144,29 @@ def generate_syscall_function(syscall: list[str]) -> str:
         f'}}\n\n'
     )
 
+# The Vdso class's wrapper of a syscall of vdso_syscalls.json, or None if the syscall's wrapper was skipped
+def generate_vdso_function(entry: str, declaration: Declaration, vdso: dict) -> str | None:
+    typeInfo, function_arguments = format_arguments(list(declaration.parameters))
 
-def get_class_fields(fields: list[str]) -> list[str]:
-    result = []
-
-    for field in fields:
-        field_type, field_name = field.split(' ')
+    if function_arguments == None or declaration.return_type not in typeConversionTable:
+        return None
 
-        if field_type not in typeConversionTable:
-            print("WARNING: Type '" + field_type + "' not found. Skipping...")
-            return ''
-        
-        raze_name, size = typeConversionTable[field_type]
+    return generate_vdso_wrapper(entry.upper(), vdso, typeInfo, function_arguments, typeConversionTable[declaration.return_type][0] + ' ')
 
-        result.append(f'{raze_name} {field_name}')
 
-    return result
+# Fields of the class, in the order of the struct's layout. Padding is named after its offset and zeroed by the constructor
+def get_class_fields(layout: StructLayout) -> list[tuple[str, str, bool]]:
+    return [ (field.raze_type, field.name or f'_padding{field.offset}', field.name is None) for field in layout.fields ]
 
-def generate_class_definition(name: str, fields: list[str]) -> str:
-    name = name.capitalize()
-    class_fields = get_class_fields(fields)
-    class_fields_decls = ''.join([ ('\t' + x + ';\n') for x in class_fields ])
-    class_fields_ctor_params = ', '.join(class_fields)
-    class_fields_ctor_asn = ''.join([ ('\t\tthis.' + x.split(' ')[1] + ' = ' + x.split(' ')[1] + ';\n') for x in class_fields ])
+def generate_class_definition(layout: StructLayout) -> str:
+    name = to_class_name(layout.name)
+    class_fields = get_class_fields(layout)
+    class_fields_decls = ''.join([ f'\t{x[0]} {x[1]};\n' for x in class_fields ])
+    class_fields_ctor_params = ', '.join([ f'{x[0]} {x[1]}' for x in class_fields if not x[2] ])
+    class_fields_ctor_asn = ''.join([ f'\t\tthis.{x[1]} = {"0u" if x[2] else x[1]};\n' for x in class_fields ])
 
     return ( ''
+        f'# struct {layout.name}: {layout.size} bytes, {layout.alignment}-byte aligned\n'
         f'class {name}\n'
         f'{{\n'
         f'{class_fields_decls}\n'
@@ -165,12 +178,38 @@ def generate_class_definition(name: str, fields: list[str]) -> str:
     )
 
 
-with open(INPUT_FILE) as fd, open('output.rz', 'w') as output:
+with open(os.path.join(RESOURCES_DIR, 'syscall_declarations.json')) as special_fd:
+    special = json.load(special_fd)
+
+with open(os.path.join(RESOURCES_DIR, 'vdso_syscalls.json')) as vdso_fd:
+    vdso_syscalls = json.load(vdso_fd)
+
+# The headers are tokenized once, and the special declarations take precedence over theirs
+declarations = index_files(args.headers)
+declarations.update(index_declarations('\n'.join(special['declarations'])))
+
+with open(args.output, 'w') as output:
     with open(os.path.join(RESOURCES_DIR, 'class_definitions.json')) as class_defs_fd:
         class_defs = json.load(class_defs_fd)
-        for name, fields in class_defs.items():
-            output.write(generate_class_definition(name, fields))
+        layouts = LayoutCalculator(class_defs, typeConversionTable)
+        for name in class_defs:
+            output.write(generate_class_definition(layouts.get_layout(name)))
+
+    vdso_wrappers = []
+    for number, entry in read_syscall_table(args.table):
+        declaration = get_declaration(entry, declarations, special)
+        if declaration is None:
+            print("WARNING: No information on syscall #" + number + " '" + entry + "'. Skipping...")
+            continue
+        output.write(generate_syscall_function(number, entry, declaration, vdso_syscalls.get(entry), args.inline))
+
+        if entry in vdso_syscalls and (wrapper := generate_vdso_function(entry, declaration, vdso_syscalls[entry])) is not None:
+            vdso_wrappers.append((vdso_syscalls[entry]['symbol'], wrapper))
+
+    # The syscalls with a vDSO fast path are also wrapped by the Vdso class, which resolves their symbols once
+    if vdso_wrappers:
+        output.write(generate_vdso_class(vdso_wrappers))
 
-    for line in fd.readlines():
-        syscall = [x.strip() for x in re.split(r'\t|,|\(|\)|\]\]', line)]
-        output.write(generate_syscall_function(syscall))
+if args.uapi_include:
+    with open(os.path.join(RESOURCES_DIR, 'uapi_constants.json')) as constants_fd, open(args.constants_output, 'w') as output:
+        output.write(generate_constants_module(args.uapi_include, json.load(constants_fd)))
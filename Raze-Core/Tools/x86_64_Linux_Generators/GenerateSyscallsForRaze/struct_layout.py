@@ -0,0 +1,113 @@
+import re
+from typing import NamedTuple
+
+# Computes the x86-64 (System V) layout of the C structs of class_definitions.json, so they can be emitted as Raze classes.
+# Raze lays a class's fields out back to back without alignment, and a class-typed field is a reference, so the layout is
+# flattened: nested structs and arrays become one field per scalar, and padding becomes explicit fields.
+#
+# A definition is a list of fields, or { "packed" : true, "fields" : [...] } for __attribute__((packed)) structs. A field is
+#   'TYPE NAME' or 'TYPE NAME[N]', where TYPE is a type of types.json or 'struct NAME' of another definition
+#   [ 'TYPE NAME', ... ], a union of the fields. Only its first field is emitted, padded to the union's size
+
+FIELD_PATTERN = re.compile(r'^(.+?)\s*\b([A-Za-z_][A-Za-z_0-9]*)(?:\[([0-9]+)\])?$')
+
+class Field(NamedTuple):
+    # None for padding
+    name: str | None
+    offset: int
+    size: int
+    raze_type: str
+
+class StructLayout(NamedTuple):
+    name: str
+    size: int
+    alignment: int
+    fields: tuple[Field, ...]
+
+# Padding is split into the largest unsigned integers that fit
+PADDING_TYPES = [(8, 'uint64'), (4, 'uint'), (2, 'uint16'), (1, 'uint8')]
+
+def get_padding(offset: int, size: int) -> list[Field]:
+    result: list[Field] = []
+    while size:
+        padding, raze_type = next(x for x in PADDING_TYPES if x[0] <= size)
+        result.append(Field(None, offset, padding, raze_type))
+        offset += padding
+        size -= padding
+    return result
+
+def align_up(offset: int, alignment: int) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+class LayoutCalculator:
+    def __init__(self, definitions: dict, types: dict[str, list]) -> None:
+        self.definitions = definitions
+        self.types = types
+        self.layouts: dict[str, StructLayout] = {}
+
+    def get_layout(self, name: str) -> StructLayout:
+        if name not in self.layouts:
+            if name not in self.definitions:
+                raise Exception(f"Struct '{name}' not defined")
+            definition = self.definitions[name]
+            if isinstance(definition, list):
+                definition = { 'fields' : definition }
+            self.layouts[name] = self.calculate_layout(name, definition['fields'], definition.get('packed', False))
+        return self.layouts[name]
+
+    # Size, alignment and flattened fields (at offset 0) of a field declaration
+    def get_field(self, field: str, packed: bool) -> tuple[int, int, list[Field]]:
+        match = FIELD_PATTERN.match(field.strip())
+        if match is None:
+            raise Exception(f"Invalid field '{field}'")
+        field_type, name, count = re.sub(r'\s*\*', ' *', match.group(1)).strip(), match.group(2), match.group(3)
+
+        if field_type.startswith('struct ') and not field_type.endswith('*'):
+            nested = self.get_layout(field_type.removeprefix('struct ').strip())
+            size, alignment = nested.size, nested.alignment
+            fields = [x._replace(name=f'{name}_{x.name}' if x.name else None) for x in nested.fields]
+        elif field_type in self.types:
+            raze_type, size = self.types[field_type]
+            alignment = size
+            fields = [Field(name, 0, size, raze_type)]
+        else:
+            raise Exception(f"Type '{field_type}' not found")
+
+        if packed:
+            alignment = 1
+        if count is None:
+            return size, alignment, fields
+
+        # Arrays: one field per element, NAME_0, NAME_1, ...
+        elements = []
+        for i in range(int(count)):
+            elements += [x._replace(name=(x.name.replace(name, f'{name}_{i}', 1) if x.name else None), offset=x.offset + i * size) for x in fields]
+        return size * int(count), alignment, elements
+
+    def calculate_layout(self, name: str, declarations: list, packed: bool) -> StructLayout:
+        fields: list[Field] = []
+        offset = 0
+        struct_alignment = 1
+
+        for declaration in declarations:
+            if isinstance(declaration, list):
+                members = [self.get_field(x, packed) for x in declaration]
+                size, alignment = max(x[0] for x in members), max(x[1] for x in members)
+                member_size, _, member_fields = members[0]
+                member_fields = member_fields + get_padding(member_size, size - member_size)
+            else:
+                size, alignment, member_fields = self.get_field(declaration, packed)
+
+            aligned = align_up(offset, alignment)
+            fields += get_padding(offset, aligned - offset)
+            fields += [x._replace(offset=x.offset + aligned) for x in member_fields]
+            offset = aligned + size
+            struct_alignment = max(struct_alignment, alignment)
+
+        size = align_up(offset, struct_alignment)
+        fields += get_padding(offset, size - offset)
+        return StructLayout(name, size, struct_alignment, tuple(fields))
+
+# 'io_uring_params' -> 'IoUringParams'
+def to_class_name(name: str) -> str:
+    return ''.join(x.capitalize() for x in name.split('_'))
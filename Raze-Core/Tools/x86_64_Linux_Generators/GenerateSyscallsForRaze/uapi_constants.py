@@ -0,0 +1,117 @@
+import os
+import re
+import ast
+import operator
+from declaration_index import COMMENT_PATTERN
+
+# Extracts the integer constants (#define NAME VALUE) of the kernel's uapi headers, and emits them as a Raze module. Raze has no
+# constants, so each one is a static inline function of a class, e.g. Mman.PROT_READ(), which the inliner folds into its value.
+# uapi_constants.json lists the headers, relative to the uapi include directory, and the classes to emit: each maps prefixes of
+# constant names to the Raze type of their constants (the longest matching prefix applies)
+
+DEFINE_PATTERN = re.compile(r'^[ \t]*#[ \t]*define[ \t]+([A-Za-z_][A-Za-z_0-9]*)(?![A-Za-z_0-9(])[ \t]*(.*)$', re.MULTILINE)
+# Casts of the uapi headers, e.g. (__poll_t)0x1, (__force __poll_t)(1U << 31)
+CAST_PATTERN = re.compile(r'\(\s*(?:__force\s+)?(?:__[A-Za-z_0-9]+|unsigned|int|long)\s*\)')
+INTEGER_PATTERN = re.compile(r'\b(0[xX][0-9a-fA-F]+|[0-9]+)[uUlL]*\b')
+
+# Directories, relative to the include directory, searched for a header. Distributions install the x86 asm headers under
+# x86_64-linux-gnu, while `make headers_install` puts them in include/asm
+ARCH_DIRECTORIES = ['', 'x86_64-linux-gnu']
+
+OPERATORS = {
+    ast.BitOr : operator.or_, ast.BitAnd : operator.and_, ast.BitXor : operator.xor, ast.LShift : operator.lshift, ast.RShift : operator.rshift,
+    ast.Add : operator.add, ast.Sub : operator.sub, ast.Mult : operator.mul, ast.Invert : operator.invert, ast.USub : operator.neg, ast.UAdd : operator.pos
+}
+
+def find_header(include_dir: str, header: str) -> str | None:
+    for directory in ARCH_DIRECTORIES:
+        path = os.path.join(include_dir, directory, header)
+        if os.path.isfile(path):
+            return path
+    return None
+
+# Name -> unevaluated value of each object-like macro. A macro defined more than once (e.g. under #ifndef) keeps its first value
+def read_defines(files: list[str]) -> dict[str, str]:
+    result: dict[str, str] = {}
+    for file in files:
+        with open(file) as fd:
+            source = COMMENT_PATTERN.sub(' ', fd.read()).replace('\\\n', ' ')
+        for name, value in DEFINE_PATTERN.findall(source):
+            result.setdefault(name, value.strip())
+    return result
+
+def evaluate_node(node: ast.AST) -> int:
+    match node:
+        case ast.Expression():
+            return evaluate_node(node.body)
+        case ast.Constant(value=int(value)):
+            return value
+        case ast.BinOp() if type(node.op) in OPERATORS:
+            return OPERATORS[type(node.op)](evaluate_node(node.left), evaluate_node(node.right))
+        case ast.UnaryOp() if type(node.op) in OPERATORS:
+            return OPERATORS[type(node.op)](evaluate_node(node.operand))
+    raise ValueError(ast.dump(node))
+
+# The value of a macro, following the macros it references, or None if it is not an integer expression
+def evaluate(name: str, defines: dict[str, str], seen: frozenset[str] = frozenset()) -> int | None:
+    if name not in defines or name in seen:
+        return None
+
+    expression = CAST_PATTERN.sub('', defines[name])
+    # C integer literals: drop the suffixes, and octal literals (leading 0) become Python's 0o
+    expression = INTEGER_PATTERN.sub(lambda x: ('0o' + x.group(1)[1:]) if re.fullmatch(r'0[0-7]+', x.group(1)) else x.group(1), expression)
+
+    for reference in set(re.findall(r'\b[A-Za-z_][A-Za-z_0-9]*', expression)):
+        value = evaluate(reference, defines, seen | { name })
+        if value is None:
+            return None
+        expression = re.sub(rf'\b{reference}\b', str(value), expression)
+
+    try:
+        return evaluate_node(ast.parse(expression.strip(), mode='eval'))
+    except (SyntaxError, ValueError):
+        return None
+
+def get_constant_type(name: str, prefixes: dict[str, str]) -> str | None:
+    prefix = max((x for x in prefixes if name.startswith(x)), key=len, default=None)
+    return prefixes[prefix] if prefix is not None else None
+
+def format_literal(value: int, raze_type: str) -> str:
+    return hex(value) + ('u' if raze_type.startswith('uint') else '')
+
+def generate_constants_class(name: str, constants: list[tuple[str, str, int]]) -> str:
+    functions = '\n'.join(
+        f'\tfunction static inline {raze_type} {constant}()\n'
+        f'\t{{\n'
+        f'\t\treturn {format_literal(value, raze_type)};\n'
+        f'\t}}\n'
+        for constant, raze_type, value in constants
+    )
+    return ( ''
+        f'class {name}\n'
+        f'{{\n'
+        f'{functions}'
+        f'}}\n\n'
+    )
+
+def generate_constants_module(include_dir: str, definition: dict) -> str:
+    files = []
+    for header in definition['headers']:
+        if (path := find_header(include_dir, header)) is None:
+            print("WARNING: Header '" + header + "' not found. Skipping...")
+            continue
+        files.append(path)
+    defines = read_defines(files)
+
+    result = ''
+    for class_name, prefixes in definition['classes'].items():
+        constants = []
+        for name in defines:
+            if (raze_type := get_constant_type(name, prefixes)) is None:
+                continue
+            if (value := evaluate(name, defines)) is None:
+                print("WARNING: Constant '" + name + "' is not an integer. Skipping...")
+                continue
+            constants.append((name, raze_type, value))
+        result += generate_constants_class(class_name, constants)
+    return result
@@ -0,0 +1,291 @@
+# Emits the vDSO fast paths of the syscalls of vdso_syscalls.json (clock_gettime, gettimeofday, time, getcpu), which the kernel
+# implements in the vDSO, an ELF image it maps into every process, so they run without entering the kernel.
+# The Vdso class resolves the symbols once, when it is constructed (e.g. at startup): it finds the image through the AT_SYSINFO_EHDR
+# entry of the auxiliary vector, and looks the symbols up in its dynamic symbol table. Each wrapper calls its symbol with the
+# RazeCall (System V) convention, or falls back to the syscall when the symbol is missing.
+#
+# vdso_syscalls.json maps a syscall's entry point to its vDSO symbol and the C return type of the symbol ('int' results are
+# sign extended, to match the syscall's long)
+
+# Parameter registers of the RazeCall convention. Unlike the syscall convention, the fourth is RCX
+argRegs = [
+    ('rdi', 'edi', 'di', 'dil'),
+    ('rsi', 'esi', 'si', 'sil'),
+    ('rdx', 'edx', 'dx', 'dl'),
+    ('rcx', 'ecx', 'cx', 'cl'),
+    ('r8', 'r8d', 'r8w', 'r8b'),
+    ('r9', 'r9d', 'r9w', 'r9b')
+]
+bytesToIndex = {
+    1 : 3,
+    2 : 2,
+    4 : 1,
+    8 : 0
+}
+
+# '__vdso_clock_gettime' -> 'clock_gettime', the field holding the symbol's address
+def get_field_name(symbol: str) -> str:
+    return symbol.removeprefix('__vdso_')
+
+# A comment marking the syscall wrappers that have a vDSO fast path
+def generate_vdso_mark(symbol: str, function_name: str) -> str:
+    return f'# vDSO: {symbol}, called by Vdso.{function_name.removeprefix("SYS_")} without entering the kernel\n'
+
+# typeInfo and function_arguments are those of the syscall's wrapper (format_arguments), whose first typeInfo is the syscall number's
+def generate_vdso_wrapper(function_name: str, vdso: dict, typeInfo: list[tuple], function_arguments: str, return_type_name: str) -> str:
+    names = [x.split()[-1] for x in function_arguments.split(', ')] if function_arguments else []
+    field_name = get_field_name(vdso['symbol'])
+
+    # An int result is read from EAX into a local and sign extended, as the upper half of RAX is undefined
+    sign_extend = vdso['return'] == 'int'
+    allocs = f'\t\t\talloc {"EAX" if sign_extend else "RAX"};\n'
+    instructions = ''
+    for i, name in enumerate(names):
+        register = argRegs[i][bytesToIndex[typeInfo[i + 1][0]]].upper()
+        allocs += f'\t\t\talloc {register};\n'
+        instructions += f'\t\t\tMOV {register}, ${name};\n'
+    instructions += '\t\t\tCALL $vdsoSymbol;\n\n'
+    instructions += '\t\t\tMOV $vdsoResult, EAX;\n' if sign_extend else '\t\t\treturn RAX;\n'
+
+    result_decl = '\t\tint vdsoResult = 0;\n' if sign_extend else ''
+    result_return = '\t\treturn vdsoResult as int64;\n' if sign_extend else ''
+
+    return ( ''
+        f'\tfunction unsafe {return_type_name}{function_name.removeprefix("SYS_")}({function_arguments})\n'
+        f'\t{{\n'
+        f'\t\tuint64 vdsoSymbol = this.{field_name};\n'
+        f'\t\tif (vdsoSymbol == 0u)\n'
+        f'\t\t{{\n'
+        f'\t\t\treturn {function_name}({", ".join(names)});\n'
+        f'\t\t}}\n'
+        f'{result_decl}'
+        f'\t\tasm {{\n'
+        f'{allocs}\n'
+        f'{instructions}'
+        f'\t\t}}\n'
+        f'{result_return}'
+        f'\t}}\n\n'
+    )
+
+# The image's lookup. Only the dynamic symbol table and DT_HASH are read, which the x86-64 vDSO always has, and symbol versions are
+# not checked, as the vDSO defines each symbol once
+VDSO_RESOLVER = '''\
+	# The vDSO's ELF image, the AT_SYSINFO_EHDR (33) entry of the auxiliary vector, or 0. The program driver does not keep the
+	# initial stack, so the auxiliary vector is read from /proc/self/auxv
+	function unsafe static uint64 GetImage()
+	{
+		AuxvEntry entry = new AuxvEntry();
+		int64 fd = AuxvEntry.Open("/proc/self/auxv");
+		uint64 image = 0u;
+
+		if (fd < 0)
+		{
+			return 0u;
+		}
+		while (AuxvEntry.Read(fd as uint, entry) == 16 && entry.a_type != 0u)
+		{
+			if (entry.a_type == 33u)
+			{
+				image = entry.a_val;
+			}
+		}
+		AuxvEntry.Close(fd as uint);
+		return image;
+	}
+
+	# The address of a function of the image's dynamic symbol table, or 0
+	function unsafe static uint64 Lookup(uint64 image, string name)
+	{
+		if (image == 0u)
+		{
+			return 0u;
+		}
+
+		# Program headers: PT_LOAD (1) gives the image's load bias, and PT_DYNAMIC (2) the address of the dynamic section
+		uint64 bias = image;
+		uint64 dynamic = 0u;
+		uint64 phdr = image + Vdso.Load64(image + 32u);
+		uint64 phentsize = Vdso.Load16(image + 54u) as uint64;
+		uint64 phnum = Vdso.Load16(image + 56u) as uint64;
+
+		for (uint64 i = 0u; i < phnum; i++)
+		{
+			uint64 header = phdr + i * phentsize;
+			uint type = Vdso.Load32(header);
+
+			if (type == 1u)
+			{
+				bias = image + Vdso.Load64(header + 8u) - Vdso.Load64(header + 16u);
+			}
+			if (type == 2u)
+			{
+				dynamic = Vdso.Load64(header + 16u);
+			}
+		}
+		if (dynamic == 0u)
+		{
+			return 0u;
+		}
+
+		# Dynamic section, up to DT_NULL (0): DT_HASH (4), DT_STRTAB (5) and DT_SYMTAB (6)
+		uint64 hash = 0u;
+		uint64 strtab = 0u;
+		uint64 symtab = 0u;
+
+		for (uint64 entry = dynamic + bias; Vdso.Load64(entry) != 0u; entry = entry + 16u)
+		{
+			uint64 tag = Vdso.Load64(entry);
+			uint64 value = Vdso.Load64(entry + 8u) + bias;
+
+			if (tag == 4u)
+			{
+				hash = value;
+			}
+			if (tag == 5u)
+			{
+				strtab = value;
+			}
+			if (tag == 6u)
+			{
+				symtab = value;
+			}
+		}
+		if (hash == 0u || strtab == 0u || symtab == 0u)
+		{
+			return 0u;
+		}
+
+		# The symbol table has an entry per link of the hash table's chain (nchain, its second word). Only the defined (st_shndx)
+		# functions (STT_FUNC, 2) match
+		uint64 count = Vdso.Load32(hash + 4u) as uint64;
+
+		for (uint64 i = 0u; i < count; i++)
+		{
+			uint64 symbol = symtab + i * 24u;
+
+			if ((Vdso.Load8(symbol + 4u) & 15u) == 2u && Vdso.Load16(symbol + 6u) != 0u && Vdso.NameEquals(strtab + (Vdso.Load32(symbol) as uint64), name))
+			{
+				return Vdso.Load64(symbol + 8u) + bias;
+			}
+		}
+		return 0u;
+	}
+
+	function unsafe static bool NameEquals(uint64 address, string name)
+	{
+		uint64 i = 0u;
+		while (name[i] != 0u)
+		{
+			if (Vdso.Load8(address + i) != name[i].ToByte())
+			{
+				return false;
+			}
+			i++;
+		}
+		return Vdso.Load8(address + i) == 0u;
+	}
+
+	function unsafe static inline uint64 Load64(uint64 address)
+	{
+		asm { return QWORD [$address]; }
+	}
+
+	function unsafe static inline uint Load32(uint64 address)
+	{
+		asm { return DWORD [$address]; }
+	}
+
+	function unsafe static inline uint16 Load16(uint64 address)
+	{
+		asm { return WORD [$address]; }
+	}
+
+	function unsafe static inline uint8 Load8(uint64 address)
+	{
+		asm { return BYTE [$address]; }
+	}
+'''
+
+# An entry of the auxiliary vector (Elf64_auxv_t), and the syscalls reading them
+AUXV_ENTRY_CLASS = '''class AuxvEntry
+{
+	uint64 a_type;
+	uint64 a_val;
+
+	function AuxvEntry()
+	{
+		this.a_type = 0u;
+		this.a_val = 0u;
+	}
+
+	function unsafe static int64 Open(string filename)
+	{
+		asm {
+			alloc RAX;
+			alloc RDI;
+			alloc ESI;
+
+			MOV RAX, 2;
+			MOV RDI, $filename;
+			MOV ESI, 0;
+			SYSCALL;
+
+			return RAX;
+		}
+	}
+
+	function unsafe static int64 Read(uint fd, AuxvEntry entry)
+	{
+		asm {
+			alloc RAX;
+			alloc EDI;
+			alloc RSI;
+			alloc RDX;
+
+			MOV RAX, 0;
+			MOV EDI, $fd;
+			MOV RSI, $entry;
+			MOV RDX, 16;
+			SYSCALL;
+
+			return RAX;
+		}
+	}
+
+	function unsafe static int64 Close(uint fd)
+	{
+		asm {
+			alloc RAX;
+			alloc EDI;
+
+			MOV RAX, 3;
+			MOV EDI, $fd;
+			SYSCALL;
+
+			return RAX;
+		}
+	}
+}
+
+'''
+
+# wrappers: (symbol, wrapper) of each syscall with a vDSO fast path
+def generate_vdso_class(wrappers: list[tuple[str, str]]) -> str:
+    fields = ''.join(f'\tuint64 {get_field_name(symbol)};\n' for symbol, _ in wrappers)
+    lookups = ''.join(f'\t\tthis.{get_field_name(symbol)} = Vdso.Lookup(image, "{symbol}");\n' for symbol, _ in wrappers)
+
+    return ( ''
+        f'{AUXV_ENTRY_CLASS}'
+        f'# Addresses of the vDSO symbols, or 0 when missing\n'
+        f'class Vdso\n'
+        f'{{\n'
+        f'{fields}\n'
+        f'\tfunction Vdso()\n'
+        f'\t{{\n'
+        f'\t\tuint64 image = Vdso.GetImage();\n'
+        f'{lookups}'
+        f'\t}}\n\n'
+        f'{"".join(x[1] for x in wrappers)}'
+        f'{VDSO_RESOLVER}'
+        f'}}\n\n'
+    )